@@ -24,6 +24,28 @@ from typing import BinaryIO
 
 SECTOR_SIZE = 512
 
+# BPB (offsets 11..35): bytes/sector, sectors/cluster, reserved sectors, FAT count,
+# root entries, total sectors (16-bit), media, sectors/FAT, sectors/track, heads,
+# hidden sectors, total sectors (32-bit)
+_BPB = struct.Struct("<HBHBHHBHHHII")
+
+_JUMP_OEM = b"\xEB\x3C\x90" + b"MSDOS5.0"
+
+# EBPB (offsets 36..61): drive number, reserved, boot signature, volume id,
+# 11-byte label, filesystem type
+_EBPB = struct.pack("<BBBI11s8s", 0x80, 0x00, 0x29, 0xA1B2C3D4, b"CRYPTOANALY", b"FAT16   ")
+
+# FAT16 entries 0 and 1: media descriptor + end-of-chain
+_FAT16_HEAD = struct.pack("<HH", 0xFFF8, 0xFFFF)
+
+# bootable flag, CHS first, partition type, CHS last, start LBA, size in sectors
+_MBR_ENTRY = struct.Struct("<B3sB3sII")
+
+# CHS values are mostly ignored by modern tooling; use "max" as common convention.
+_CHS_MAX = bytes([0xFE, 0xFF, 0xFF])
+
+_BOOT_SIGNATURE = b"\x55\xAA"
+
 
 @dataclass(frozen=True, slots=True)
 class Fat16Layout:
@@ -50,22 +72,18 @@ def compute_fat16_layout(*, total_sectors: int) -> Fat16Layout:
 
     root_dir_sectors = _ceil_div(root_entry_count * 32, bytes_per_sector)
 
-    fat_size_sectors = 1
-    for _ in range(32):
-        first_data_sector = reserved_sectors + (num_fats * fat_size_sectors) + root_dir_sectors
-        data_sectors = total_sectors - first_data_sector
-        if data_sectors <= 0:
-            raise ValueError("Partition too small for FAT16")
-
-        cluster_count = data_sectors // sectors_per_cluster
-        fat_bytes = (cluster_count + 2) * 2
-        new_fat_size_sectors = _ceil_div(fat_bytes, bytes_per_sector)
-
-        if new_fat_size_sectors == fat_size_sectors:
-            break
-        fat_size_sectors = new_fat_size_sectors
-    else:
-        raise RuntimeError("FAT16 layout did not converge")
+    # The FAT must hold 2 bytes per data cluster plus the two reserved entries, and the
+    # data region shrinks as the FATs grow:
+    #   fat_size * bps >= ((total - fixed - num_fats * fat_size) / spc + 2) * 2
+    # so the smallest fitting size is a single ceiling division; no fixpoint iteration
+    # is needed.
+    fixed_sectors = reserved_sectors + root_dir_sectors
+    fat_size_sectors = _ceil_div(
+        (total_sectors - fixed_sectors + 2 * sectors_per_cluster) * 2,
+        bytes_per_sector * sectors_per_cluster + 2 * num_fats,
+    )
+    if total_sectors - fixed_sectors - num_fats * fat_size_sectors <= 0:
+        raise ValueError("Partition too small for FAT16")
 
     first_data_sector = reserved_sectors + (num_fats * fat_size_sectors) + root_dir_sectors
     data_sectors = total_sectors - first_data_sector
@@ -90,22 +108,8 @@ def compute_fat16_layout(*, total_sectors: int) -> Fat16Layout:
 
 def build_mbr_single_partition(*, start_lba: int, size_sectors: int, ptype: int) -> bytes:
     mbr = bytearray(SECTOR_SIZE)
-
-    # Partition table entry (16 bytes) at offset 446
-    # CHS values are mostly ignored by modern tooling; use "max" as common convention.
-    chs_max = bytes([0xFE, 0xFF, 0xFF])
-    entry = bytearray(16)
-    entry[0] = 0x00  # bootable flag
-    entry[1:4] = chs_max
-    entry[4] = ptype
-    entry[5:8] = chs_max
-    entry[8:12] = struct.pack("<I", start_lba)
-    entry[12:16] = struct.pack("<I", size_sectors)
-
-    mbr[446 : 446 + 16] = entry
-
-    # MBR signature
-    mbr[510:512] = b"\x55\xAA"
+    _MBR_ENTRY.pack_into(mbr, 446, 0x00, _CHS_MAX, ptype, _CHS_MAX, start_lba, size_sectors)
+    mbr[510:512] = _BOOT_SIGNATURE
     return bytes(mbr)
 
 
@@ -113,72 +117,75 @@ def build_fat16_boot_sector(*, layout: Fat16Layout, hidden_sectors: int) -> byte
     b = bytearray(SECTOR_SIZE)
 
     # Jump + OEM
-    b[0:3] = b"\xEB\x3C\x90"
-    b[3:11] = b"MSDOS5.0"
-
-    # BPB
-    struct.pack_into("<H", b, 11, layout.bytes_per_sector)
-    struct.pack_into("<B", b, 13, layout.sectors_per_cluster)
-    struct.pack_into("<H", b, 14, layout.reserved_sectors)
-    struct.pack_into("<B", b, 16, layout.num_fats)
-    struct.pack_into("<H", b, 17, layout.root_entry_count)
-    struct.pack_into("<H", b, 19, layout.total_sectors if layout.total_sectors <= 0xFFFF else 0)
-    struct.pack_into("<B", b, 21, 0xF8)  # media
-    struct.pack_into("<H", b, 22, layout.fat_size_sectors)
-    struct.pack_into("<H", b, 24, 63)  # sectors/track
-    struct.pack_into("<H", b, 26, 255)  # heads
-    struct.pack_into("<I", b, 28, hidden_sectors)
-    struct.pack_into("<I", b, 32, 0 if layout.total_sectors <= 0xFFFF else layout.total_sectors)
-
-    # EBPB
-    b[36] = 0x80  # drive number
-    b[37] = 0x00
-    b[38] = 0x29  # boot signature
-    struct.pack_into("<I", b, 39, 0xA1B2C3D4)  # volume id
-    b[43:54] = b"CRYPTOANALYZ"  # 11 bytes label
-    b[54:62] = b"FAT16   "
+    b[0:11] = _JUMP_OEM
+
+    small_total = layout.total_sectors <= 0xFFFF
+    _BPB.pack_into(
+        b,
+        11,
+        layout.bytes_per_sector,
+        layout.sectors_per_cluster,
+        layout.reserved_sectors,
+        layout.num_fats,
+        layout.root_entry_count,
+        layout.total_sectors if small_total else 0,
+        0xF8,  # media
+        layout.fat_size_sectors,
+        63,  # sectors/track
+        255,  # heads
+        hidden_sectors,
+        0 if small_total else layout.total_sectors,
+    )
+
+    b[36:62] = _EBPB
 
     # Signature
-    b[510:512] = b"\x55\xAA"
+    b[510:512] = _BOOT_SIGNATURE
 
     return bytes(b)
 
 
-def write_fat16_partition(
-    file: BinaryIO,
+def build_image_prefix(
     *,
     partition_start_lba: int,
     partition_total_sectors: int,
-) -> None:
-    layout = compute_fat16_layout(total_sectors=partition_total_sectors)
+    ptype: int,
+) -> bytearray:
+    """Compose every non-zero byte of the image (MBR, boot sector, FAT heads) in one buffer.
 
-    base = partition_start_lba * SECTOR_SIZE
+    The rest of each FAT, the root directory and the data region are zero, so they are
+    left to the truncated (sparse) file and the buffer ends right after the last FAT head.
+    """
 
-    # Boot sector
-    boot = build_fat16_boot_sector(layout=layout, hidden_sectors=partition_start_lba)
-    file.seek(base)
-    file.write(boot)
+    layout = compute_fat16_layout(total_sectors=partition_total_sectors)
 
-    # FATs
+    base = partition_start_lba * SECTOR_SIZE
     fat_offset = base + (layout.reserved_sectors * SECTOR_SIZE)
     fat_bytes_total = layout.fat_size_sectors * SECTOR_SIZE
+    last_fat_offset = fat_offset + (layout.num_fats - 1) * fat_bytes_total
 
-    fat = bytearray(fat_bytes_total)
-    # FAT16 first two entries: media descriptor + EOC
-    struct.pack_into("<H", fat, 0, 0xFFF8)
-    struct.pack_into("<H", fat, 2, 0xFFFF)
-
+    prefix = bytearray(last_fat_offset + len(_FAT16_HEAD))
+    prefix[0:SECTOR_SIZE] = build_mbr_single_partition(
+        start_lba=partition_start_lba,
+        size_sectors=partition_total_sectors,
+        ptype=ptype,
+    )
+    prefix[base : base + SECTOR_SIZE] = build_fat16_boot_sector(
+        layout=layout, hidden_sectors=partition_start_lba
+    )
     for i in range(layout.num_fats):
-        file.seek(fat_offset + i * fat_bytes_total)
-        file.write(fat)
+        start = fat_offset + i * fat_bytes_total
+        prefix[start : start + len(_FAT16_HEAD)] = _FAT16_HEAD
+
+    return prefix
 
-    # Root directory (zeroed)
-    root_dir_offset = fat_offset + (layout.num_fats * fat_bytes_total)
-    root_dir_bytes = layout.root_dir_sectors * SECTOR_SIZE
-    file.seek(root_dir_offset)
-    file.write(b"\x00" * root_dir_bytes)
 
-    # Data region can stay zero-filled (file was truncated)
+def _write_at(file: BinaryIO, data: bytes | bytearray, offset: int) -> None:
+    if hasattr(os, "pwrite"):
+        os.pwrite(file.fileno(), data, offset)
+    else:  # Windows
+        file.seek(offset)
+        file.write(data)
 
 
 def main() -> int:
@@ -217,22 +224,15 @@ def main() -> int:
     # Add a bit of slack after the partition.
     total_sectors = partition_start_lba + partition_total_sectors + 2048
 
-    mbr = build_mbr_single_partition(
-        start_lba=partition_start_lba,
-        size_sectors=partition_total_sectors,
+    prefix = build_image_prefix(
+        partition_start_lba=partition_start_lba,
+        partition_total_sectors=partition_total_sectors,
         ptype=0x0E,  # FAT16 LBA
     )
 
     with output.open("w+b") as f:
         f.truncate(total_sectors * SECTOR_SIZE)
-        f.seek(0)
-        f.write(mbr)
-
-        write_fat16_partition(
-            f,
-            partition_start_lba=partition_start_lba,
-            partition_total_sectors=partition_total_sectors,
-        )
+        _write_at(f, prefix, 0)
 
         f.flush()
         os.fsync(f.fileno())
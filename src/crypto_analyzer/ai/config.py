@@ -4,6 +4,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 import os
+import re
 from pathlib import Path
 from urllib.parse import urlparse
 
@@ -16,6 +17,7 @@ class AiConfig:
     timeout_seconds: float = 120.0
     max_retries: int = 3
     retry_backoff_seconds: float = 1.0
+    max_connections: int = 4
 
 
 _SUPPORTED_ENV_KEYS = {
@@ -25,6 +27,7 @@ _SUPPORTED_ENV_KEYS = {
     "CRYPTOAI_TIMEOUT_SECONDS",
     "CRYPTOAI_MAX_RETRIES",
     "CRYPTOAI_RETRY_BACKOFF_SECONDS",
+    "CRYPTOAI_MAX_CONNECTIONS",
     "OPENAI_API_KEY",
     "OPENAI_ENDPOINT",
     "OPENAI_BASE_URL",
@@ -32,9 +35,15 @@ _SUPPORTED_ENV_KEYS = {
     "OPENAI_TIMEOUT_SECONDS",
     "OPENAI_MAX_RETRIES",
     "OPENAI_RETRY_BACKOFF_SECONDS",
+    "OPENAI_MAX_CONNECTIONS",
 }
 
 
+_DOTENV_LINE = re.compile(r"""^\s*([^=\s]+)\s*=\s*["']?(.*?)["']?\s*$""")
+
+_DOTENV_LOADED = False
+
+
 def _load_dotenv_if_present() -> None:
     """Best-effort .env loader.
 
@@ -46,10 +55,16 @@ def _load_dotenv_if_present() -> None:
     - Only loads known keys used by this project.
     - Never overwrites variables already present in os.environ.
     - Searches in CWD and (when installed editable) the project root.
+    - Runs at most once per process; later calls are no-ops.
     """
 
+    global _DOTENV_LOADED
+
     if (os.getenv("CRYPTOANALYZER_DISABLE_DOTENV") or "").strip().lower() in {"1", "true", "yes", "on"}:
         return
+    if _DOTENV_LOADED:
+        return
+    _DOTENV_LOADED = True
 
     candidates: list[Path] = [Path.cwd() / ".env"]
 
@@ -66,18 +81,14 @@ def _load_dotenv_if_present() -> None:
 
     try:
         for raw_line in dotenv_path.read_text(encoding="utf-8", errors="replace").splitlines():
-            line = raw_line.strip()
-            if not line or line.startswith("#"):
-                continue
-            if "=" not in line:
+            match = _DOTENV_LINE.match(raw_line)
+            if match is None:
                 continue
-            key, value = line.split("=", 1)
-            key = key.strip()
+            key, value = match.groups()
             if key not in _SUPPORTED_ENV_KEYS:
                 continue
             if key in os.environ and os.environ[key].strip():
                 continue
-            value = value.strip().strip('"').strip("'")
             if value:
                 os.environ[key] = value
     except Exception:
@@ -114,6 +125,7 @@ def load_ai_config() -> AiConfig | None:
         "OPENAI_RETRY_BACKOFF_SECONDS",
         default=1.0,
     )
+    max_connections = _read_int("CRYPTOAI_MAX_CONNECTIONS", "OPENAI_MAX_CONNECTIONS", default=4)
 
     if not api_key or not endpoint:
         return None
@@ -126,6 +138,7 @@ def load_ai_config() -> AiConfig | None:
         timeout_seconds=timeout_seconds,
         max_retries=max_retries,
         retry_backoff_seconds=retry_backoff_seconds,
+        max_connections=max_connections,
     )
 
 
@@ -2,11 +2,15 @@
 
 from __future__ import annotations
 
+import heapq
+import re
 from dataclasses import dataclass
 from datetime import datetime, timezone
+from functools import lru_cache
+from operator import attrgetter
 from typing import Any, Iterable
 
-from crypto_analyzer.core.models import AnalysisResult, DirectoryNode, FileMetadata
+from crypto_analyzer.core.models import AnalysisResult, FileMetadata, VolumeAnalysis
 
 
 @dataclass(slots=True)
@@ -44,6 +48,24 @@ _SUSPICIOUS_EXTENSIONS = (
     ".dat",
 )
 
+_EXTENSION_RE = re.compile("(?:" + "|".join(map(re.escape, _SUSPICIOUS_EXTENSIONS)) + ")$")
+_KEYWORD_RE = re.compile("|".join(map(re.escape, _SUSPICIOUS_KEYWORDS)))
+
+_file_fields = attrgetter(
+    "path",
+    "name",
+    "size",
+    "owner",
+    "created_at",
+    "changed_at",
+    "modified_at",
+    "accessed_at",
+    "attributes",
+    "encryption",
+)
+
+_EPOCH = datetime.min.replace(tzinfo=timezone.utc)
+
 
 def build_ai_context(
     result: AnalysisResult,
@@ -52,68 +74,14 @@ def build_ai_context(
     max_files_per_volume: int = 200,
     max_suspicious: int = 50,
 ) -> dict[str, Any]:
-    volumes_out: list[dict[str, Any]] = []
-
-    for analysis in result.volumes:
-        vol = analysis.volume
-        finding = analysis.encryption
-
-        files: list[dict[str, Any]] = []
-        suspicious: list[dict[str, str]] = []
-
-        if analysis.metadata is not None:
-            all_files = list(_iter_files(analysis.metadata.root))
-            suspicious_hits = find_suspicious(all_files, max_results=max_suspicious)
-
-            # keep a limited sample of files (largest + most recent)
-            largest = sorted(all_files, key=lambda f: int(getattr(f, "size", 0)), reverse=True)[: max_files_per_volume // 2]
-            recent = sorted(all_files, key=_sort_key_mtime, reverse=True)[: max_files_per_volume // 2]
-
-            # stable de-duplication by path
-            seen: set[str] = set()
-            for file_meta in largest + recent:
-                p = str(file_meta.path)
-                if p in seen:
-                    continue
-                seen.add(p)
-                files.append(
-                    {
-                        "path": p,
-                        "name": file_meta.name,
-                        "size": file_meta.size,
-                        "owner": file_meta.owner,
-                        "created_at": file_meta.created_at,
-                        "changed_at": file_meta.changed_at,
-                        "modified_at": file_meta.modified_at,
-                        "accessed_at": file_meta.accessed_at,
-                        "attributes": list(file_meta.attributes),
-                        "encryption": file_meta.encryption.value,
-                    }
-                )
-                if len(files) >= max_files_per_volume:
-                    break
-
-            suspicious = [{"path": h.path, "reason": h.reason} for h in suspicious_hits]
-
-        volumes_out.append(
-            {
-                "id": vol.identifier,
-                "filesystem": analysis.filesystem.value,
-                "offset": vol.offset,
-                "size": vol.size,
-                "encryption": {
-                    "status": finding.status.value,
-                    "algorithm": finding.algorithm,
-                    "version": finding.version,
-                },
-                "totals": {
-                    "files": analysis.metadata.total_files if analysis.metadata else 0,
-                    "directories": analysis.metadata.total_directories if analysis.metadata else 0,
-                },
-                "files_sample": files,
-                "suspicious_hits": suspicious,
-            }
+    volumes_out = [
+        _volume_context(
+            analysis,
+            max_files_per_volume=max_files_per_volume,
+            max_suspicious=max_suspicious,
         )
+        for analysis in result.volumes
+    ]
 
     ui: dict[str, Any] | None = None
     if ui_locale:
@@ -122,6 +90,7 @@ def build_ai_context(
             "language": _locale_to_language(ui_locale),
         }
 
+    total_files, total_directories = result.totals()
     return {
         "ui": ui,
         "source": {
@@ -132,13 +101,96 @@ def build_ai_context(
         },
         "totals": {
             "volumes": len(result.volumes),
-            "files": result.total_files(),
-            "directories": result.total_directories(),
+            "files": total_files,
+            "directories": total_directories,
         },
         "volumes": volumes_out,
     }
 
 
+def _volume_context(
+    analysis: VolumeAnalysis,
+    *,
+    max_files_per_volume: int,
+    max_suspicious: int,
+) -> dict[str, Any]:
+    vol = analysis.volume
+    finding = analysis.encryption
+    meta = analysis.load_metadata()
+
+    files: list[dict[str, Any]] = []
+    suspicious: list[dict[str, str]] = []
+    total_files = 0
+    total_directories = 0
+
+    if meta is not None:
+        total_files = meta.total_files
+        total_directories = meta.total_directories
+
+        # Each pass walks the tree lazily instead of materializing every file: the
+        # suspicious scan stops at max_suspicious, and heapq.nlargest keeps only `half`
+        # items (evaluating each key once), so memory stays O(sample) per volume.
+        suspicious_hits = find_suspicious(meta.root.iter_files(), max_results=max_suspicious)
+
+        # keep a limited sample of files (largest + most recent)
+        half = max_files_per_volume // 2
+        largest = heapq.nlargest(half, meta.root.iter_files(), key=_sort_key_size)
+        recent = heapq.nlargest(half, meta.root.iter_files(), key=_sort_key_mtime)
+
+        # stable de-duplication by path
+        seen: set[str] = set()
+        for file_meta in largest + recent:
+            (
+                path,
+                name,
+                size,
+                owner,
+                created_at,
+                changed_at,
+                modified_at,
+                accessed_at,
+                attributes,
+                encryption,
+            ) = _file_fields(file_meta)
+            p = str(path)
+            if p in seen:
+                continue
+            seen.add(p)
+            files.append(
+                {
+                    "path": p,
+                    "name": name,
+                    "size": size,
+                    "owner": owner,
+                    "created_at": created_at,
+                    "changed_at": changed_at,
+                    "modified_at": modified_at,
+                    "accessed_at": accessed_at,
+                    "attributes": list(attributes),
+                    "encryption": encryption.value,
+                }
+            )
+            if len(files) >= max_files_per_volume:
+                break
+
+        suspicious = [{"path": h.path, "reason": h.reason} for h in suspicious_hits]
+
+    return {
+        "id": vol.identifier,
+        "filesystem": analysis.filesystem.value,
+        "offset": vol.offset,
+        "size": vol.size,
+        "encryption": {
+            "status": finding.status.value,
+            "algorithm": finding.algorithm,
+            "version": finding.version,
+        },
+        "totals": {"files": total_files, "directories": total_directories},
+        "files_sample": files,
+        "suspicious_hits": suspicious,
+    }
+
+
 def _locale_to_language(locale: str) -> str:
     loc = (locale or "").strip().lower()
     if loc.startswith("pl"):
@@ -150,44 +202,54 @@ def _locale_to_language(locale: str) -> str:
 
 def find_suspicious(files: Iterable[FileMetadata], *, max_results: int = 50) -> list[SuspiciousHit]:
     hits: list[SuspiciousHit] = []
+    seen: set[str] = set()
+    # Local aliases keep the per-file loop down to a regex search and an append.
+    hit = SuspiciousHit
+    append = hits.append
+    ext_search = _EXTENSION_RE.search
+    kw_search = _KEYWORD_RE.search
     for file_meta in files:
         path = str(file_meta.path)
+        if path in seen:
+            continue
         lowered = path.lower()
 
-        for ext in _SUSPICIOUS_EXTENSIONS:
-            if lowered.endswith(ext):
-                hits.append(SuspiciousHit(path=path, reason=f"extension:{ext}"))
-                break
-
-        for kw in _SUSPICIOUS_KEYWORDS:
-            if kw in lowered:
-                hits.append(SuspiciousHit(path=path, reason=f"keyword:{kw}"))
-                break
-
+        # One hit per path; an extension match takes precedence over a keyword.
+        ext_match = ext_search(lowered)
+        if ext_match is not None:
+            append(hit(path, f"extension:{ext_match.group()}"))
+        else:
+            kw_match = kw_search(lowered)
+            if kw_match is None:
+                continue
+            # Leftmost keyword in the path; at the same position the alternation
+            # prefers declaration order ("password" rather than "pass").
+            append(hit(path, f"keyword:{kw_match.group(0)}"))
+
+        seen.add(path)
         if len(hits) >= max_results:
             break
 
-    # de-dup by path
-    unique: dict[str, SuspiciousHit] = {}
-    for hit in hits:
-        unique.setdefault(hit.path, hit)
-    return list(unique.values())[:max_results]
+    return hits
 
 
-def _iter_files(node: DirectoryNode) -> Iterable[FileMetadata]:
-    yield from node.files
-    for sub in node.subdirectories:
-        yield from _iter_files(sub)
+def _sort_key_size(file_meta: FileMetadata) -> int:
+    return int(getattr(file_meta, "size", 0) or 0)
 
 
 def _sort_key_mtime(file_meta: FileMetadata) -> datetime:
     raw = file_meta.modified_at
     if not raw:
-        return datetime.min.replace(tzinfo=timezone.utc)
+        return _EPOCH
+    return _parse_iso(raw)
+
+
+@lru_cache(maxsize=65536)
+def _parse_iso(raw: str) -> datetime:
     try:
         parsed = datetime.fromisoformat(raw)
         if parsed.tzinfo is None:
             return parsed.replace(tzinfo=timezone.utc)
         return parsed
     except Exception:
-        return datetime.min.replace(tzinfo=timezone.utc)
+        return _EPOCH
@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 import json
-from typing import Any
+from typing import Any, Iterable
 
 from crypto_analyzer.core.models import AnalysisResult
 
@@ -12,40 +12,61 @@ from .context import build_ai_context
 from .openai_client import OpenAIChatClient
 
 
+_SUMMARY_SYSTEM_TEMPLATE = (
+    "You are a digital forensics assistant. "
+    "Reply in %s. "
+    "You must base your output strictly on the provided JSON context. "
+    "If information is missing, say so explicitly. "
+    "Keep output concise and structured."
+)
+
+_SUMMARY_USER_TEMPLATE = (
+    "Given this disk analysis context (JSON), produce a STRICT JSON object with keys:\n"
+    "- summary: string (5-10 concise bullet lines)\n"
+    "- suspicious: string (bullet lines; reference suspicious_hits when present)\n"
+    "- next_steps: string (bullet lines)\n"
+    "Rules: output JSON only, no extra keys. Values MUST be strings (not arrays).\n\n"
+    "CONTEXT_JSON:\n%s"
+)
+
+_QUESTION_SYSTEM_TEMPLATE = (
+    "You are a digital forensics assistant. "
+    "Reply in %s. "
+    "Answer the user's question strictly using the provided JSON context. "
+    "If the answer cannot be derived from the context, say what is missing."
+)
+
+_QUESTION_USER_TEMPLATE = "Question: %s\n\nCONTEXT_JSON:\n%s"
+
+_LANGUAGE_BY_PREFIX = {"pl": "Polish", "en": "English"}
+
+
 class AiInsightsService:
-    """Generates post-analysis insights using an OpenAI-compatible endpoint."""
+    """Generates post-analysis insights using an OpenAI-compatible endpoint.
+
+    The serialized analysis context is cached per UI locale for the most recent
+    `AnalysisResult`, so a Q&A session only walks the directory tree once. The cache
+    is keyed by object identity: pass the same result instance to every call.
+    """
 
     def __init__(self, config: AiConfig) -> None:
         self._client = OpenAIChatClient(config)
+        # The result is held (not just its id()) so the key can't be reused by another object.
+        self._context_result: AnalysisResult | None = None
+        self._context_by_locale: dict[str | None, str] = {}
 
     def generate_summary_and_suspicious(self, result: AnalysisResult, *, ui_locale: str | None = None) -> dict[str, str]:
-        context = build_ai_context(result, ui_locale=ui_locale)
-        context_json = json.dumps(context, ensure_ascii=False)
-
-        language = _locale_to_language(ui_locale)
-
-        system = (
-            "You are a digital forensics assistant. "
-            f"Reply in {language}. "
-            "You must base your output strictly on the provided JSON context. "
-            "If information is missing, say so explicitly. "
-            "Keep output concise and structured."
-        )
-
-        user = (
-            "Given this disk analysis context (JSON), produce a STRICT JSON object with keys:\n"
-            "- summary: string (5-10 concise bullet lines)\n"
-            "- suspicious: string (bullet lines; reference suspicious_hits when present)\n"
-            "- next_steps: string (bullet lines)\n"
-            "Rules: output JSON only, no markdown fences, no extra keys. Values MUST be strings (not arrays).\n\n"
-            f"CONTEXT_JSON:\n{context_json}"
-        )
-
-        text = self._client.chat(system=system, user=user, temperature=0.2)
+        context_json = self._context_json(result, ui_locale)
+
+        system = _SUMMARY_SYSTEM_TEMPLATE % _locale_to_language(ui_locale)
+        user = _SUMMARY_USER_TEMPLATE % context_json
+
+        text = self._client.chat(system=system, user=user, temperature=0.2, json_mode=True)
         try:
             parsed = json.loads(text)
         except Exception:
-            # Fallback: display raw text in summary.
+            # Endpoints without response_format support may still answer in prose;
+            # display the raw text in summary.
             return {"summary": text, "suspicious": "", "next_steps": ""}
 
         summary = _normalize_bullets(parsed.get("summary", ""))
@@ -58,21 +79,26 @@ class AiInsightsService:
         if not question:
             raise ValueError("Question cannot be empty")
 
-        context = build_ai_context(result, ui_locale=ui_locale)
-        context_json = json.dumps(context, ensure_ascii=False)
+        context_json = self._context_json(result, ui_locale)
 
-        language = _locale_to_language(ui_locale)
+        system = _QUESTION_SYSTEM_TEMPLATE % _locale_to_language(ui_locale)
+        user = _QUESTION_USER_TEMPLATE % (question, context_json)
 
-        system = (
-            "You are a digital forensics assistant. "
-            f"Reply in {language}. "
-            "Answer the user's question strictly using the provided JSON context. "
-            "If the answer cannot be derived from the context, say what is missing."
-        )
+        return self._client.chat(system=system, user=user, temperature=0.1)
 
-        user = "Question: " + question + "\n\nCONTEXT_JSON:\n" + context_json
+    def _context_json(self, result: AnalysisResult, ui_locale: str | None) -> str:
+        if result is not self._context_result:
+            self._context_result = result
+            self._context_by_locale = {}
+        else:
+            cached = self._context_by_locale.get(ui_locale)
+            if cached is not None:
+                return cached
 
-        return self._client.chat(system=system, user=user, temperature=0.1)
+        context = build_ai_context(result, ui_locale=ui_locale)
+        context_json = json.dumps(context, ensure_ascii=False, separators=(",", ":"))
+        self._context_by_locale[ui_locale] = context_json
+        return context_json
 
 
 def _normalize_bullets(value: Any) -> str:
@@ -82,21 +108,7 @@ def _normalize_bullets(value: Any) -> str:
         return value
 
     if isinstance(value, list):
-        lines: list[str] = []
-        for item in value:
-            if item is None:
-                continue
-            if isinstance(item, str):
-                text = item.strip()
-            else:
-                text = str(item).strip()
-            if not text:
-                continue
-            if text.startswith("-"):
-                lines.append(text)
-            else:
-                lines.append(f"- {text}")
-        return "\n".join(lines)
+        return _join_bullets(str(item).strip() for item in value if item is not None)
 
     return str(value)
 
@@ -108,41 +120,28 @@ def _normalize_suspicious(value: Any) -> str:
         return value
 
     if isinstance(value, list):
-        lines: list[str] = []
-        for item in value:
-            if item is None:
-                continue
-
-            # Preferred structured format: {"path": ..., "reason": ...}
-            if isinstance(item, dict):
-                path = str(item.get("path", "")).strip()
-                reason = str(item.get("reason", "")).strip()
-                if not path and not reason:
-                    continue
-                if path and reason:
-                    text = f"{path} — {reason}"
-                else:
-                    text = path or reason
-            else:
-                text = str(item).strip()
-
-            if not text:
-                continue
-            if text.startswith("-"):
-                lines.append(text)
-            else:
-                lines.append(f"- {text}")
-        return "\n".join(lines)
+        return _join_bullets(_suspicious_text(item) for item in value if item is not None)
 
     return str(value)
 
 
+def _suspicious_text(item: Any) -> str:
+    # Preferred structured format: {"path": ..., "reason": ...}
+    if isinstance(item, dict):
+        path = str(item.get("path", "")).strip()
+        reason = str(item.get("reason", "")).strip()
+        if path and reason:
+            return f"{path} — {reason}"
+        return path or reason
+    return str(item).strip()
+
+
+def _join_bullets(texts: Iterable[str]) -> str:
+    return "\n".join(text if text.startswith("-") else f"- {text}" for text in texts if text)
+
+
 def _locale_to_language(locale: str | None) -> str:
     loc = (locale or "").strip().lower()
     if not loc:
         return "the same language as the UI"
-    if loc.startswith("pl"):
-        return "Polish"
-    if loc.startswith("en"):
-        return "English"
-    return loc
+    return _LANGUAGE_BY_PREFIX.get(loc[:2], loc)
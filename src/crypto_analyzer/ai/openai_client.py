@@ -6,47 +6,266 @@ Works with OpenAI and most OpenAI-compatible endpoints.
 
 from __future__ import annotations
 
+import base64
 import json
-import socket
+import random
+import threading
 import time
-from dataclasses import dataclass
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from http.client import HTTPConnection, HTTPException, HTTPResponse, HTTPSConnection
+from json.encoder import encode_basestring
 from typing import Any
-from urllib.error import HTTPError, URLError
-from urllib.request import Request, urlopen
+from urllib.parse import unquote, urlsplit
+from urllib.request import getproxies, proxy_bypass
 
 from .config import AiConfig
 
+try:  # optional C-accelerated codec; the stdlib json module is the fallback
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None  # type: ignore[assignment]
+
+
+# Fixed shape of a chat request body. Used when orjson is missing: splicing the
+# C-escaped strings into it is roughly twice as fast as a generic json.dumps().
+_CHAT_BODY_TEMPLATE = (
+    '{"model":%s,"temperature":%s,"messages":'
+    '[{"role":"system","content":%s},{"role":"user","content":%s}]%s}'
+)
+_JSON_MODE_SUFFIX = ',"response_format":{"type":"json_object"}'
+
+
+def _chat_payload(
+    model: str, temperature: float, system: str, user: str, json_mode: bool
+) -> dict[str, Any]:
+    payload: dict[str, Any] = {
+        "model": model,
+        "temperature": temperature,
+        "messages": [
+            {"role": "system", "content": system},
+            {"role": "user", "content": user},
+        ],
+    }
+    if json_mode:
+        payload["response_format"] = {"type": "json_object"}
+    return payload
+
+
+def _chat_body(model: str, temperature: float, system: str, user: str, json_mode: bool) -> bytes:
+    try:
+        if orjson is not None:
+            return orjson.dumps(_chat_payload(model, temperature, system, user, json_mode))
+
+        return (
+            _CHAT_BODY_TEMPLATE
+            % (
+                encode_basestring(model),
+                float.__repr__(temperature),
+                encode_basestring(system),
+                encode_basestring(user),
+                _JSON_MODE_SUFFIX if json_mode else "",
+            )
+        ).encode("utf-8")
+    except (UnicodeEncodeError, TypeError):
+        # Lone surrogates (e.g. text pasted through Qt) have no UTF-8 form; the
+        # ASCII-escaped stdlib encoding accepts any str, as urlopen's client did.
+        payload = _chat_payload(model, temperature, system, user, json_mode)
+        return json.dumps(payload).encode("ascii")
+
+
+def _loads(raw: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
 
 class AiClientError(RuntimeError):
     pass
 
 
-@dataclass(slots=True)
+_RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Upper bounds for the exponential backoff. Rate limiting (429) backs off further
+# than transient server/network failures, which usually clear within seconds.
+_BACKOFF_CAP_RATE_LIMITED = 60.0
+_BACKOFF_CAP_TRANSIENT = 10.0
+# Never trust a server-provided Retry-After beyond this many seconds.
+_RETRY_AFTER_CAP = 120.0
+
+
+def _parse_retry_after(value: str | None) -> float | None:
+    """Parses a ``Retry-After`` header (delta-seconds or HTTP-date) into seconds."""
+
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            when = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if when.tzinfo is None:
+            when = when.replace(tzinfo=timezone.utc)
+        seconds = (when - datetime.now(timezone.utc)).total_seconds()
+    return min(max(0.0, seconds), _RETRY_AFTER_CAP)
+
+
+def _retry_delay(attempt: int, base: float, *, status: int | None, retry_after: str | None) -> float:
+    """Delay before retry number ``attempt + 1``.
+
+    Honours ``Retry-After`` when the server sent one; otherwise exponential
+    backoff with jitter so concurrent clients do not retry in lockstep.
+    """
+
+    hinted = _parse_retry_after(retry_after)
+    if hinted is not None:
+        return hinted
+    cap = _BACKOFF_CAP_RATE_LIMITED if status == 429 else _BACKOFF_CAP_TRANSIENT
+    return min(cap, base * (2**attempt)) * random.uniform(0.5, 1.5)
+
+
+def _split_target(url: str) -> tuple[str, str, str]:
+    """Splits a URL into (scheme, netloc, request path) for ``http.client``.
+
+    Raises ``AiClientError`` unless the URL is absolute ``http``/``https`` with a host.
+    """
+
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+    if scheme not in ("http", "https") or not parts.netloc:
+        raise AiClientError(f"Invalid AI endpoint (expected an http(s):// URL with a host): {url}")
+    path = parts.path or "/"
+    if parts.query:
+        path = f"{path}?{parts.query}"
+    return scheme, parts.netloc, path
+
+
+def _resolve_proxy(scheme: str, netloc: str) -> tuple[str, dict[str, str]] | None:
+    """Proxy ``(host[:port], headers)`` for the endpoint, as ``urlopen`` would pick it.
+
+    Reads ``HTTP(S)_PROXY`` / ``NO_PROXY`` (and the platform proxy settings) via
+    ``urllib.request``; credentials in the proxy URL become a ``Proxy-Authorization``
+    header.
+    """
+
+    proxy = getproxies().get(scheme)
+    if not proxy or proxy_bypass(urlsplit(f"//{netloc}").hostname or netloc):
+        return None
+    if "://" not in proxy:
+        proxy = f"http://{proxy}"
+    parts = urlsplit(proxy)
+    hostport = parts.netloc.rpartition("@")[2]
+    if not hostport:
+        return None
+    headers: dict[str, str] = {}
+    if parts.username is not None:
+        credentials = f"{unquote(parts.username)}:{unquote(parts.password or '')}"
+        token = base64.b64encode(credentials.encode("utf-8")).decode("ascii")
+        headers["Proxy-Authorization"] = f"Basic {token}"
+    return hostport, headers
+
+
+def _message_content(raw: bytes) -> str:
+    """Pulls ``choices[0].message.content`` out of a Chat Completions response body."""
+
+    try:
+        data: dict[str, Any] = _loads(raw)
+    except Exception as exc:
+        raise AiClientError("AI returned invalid JSON") from exc
+
+    # OpenAI Chat Completions response shape
+    try:
+        return str(data["choices"][0]["message"]["content"])
+    except Exception:
+        # helpful fallback for non-standard but compatible shapes
+        if isinstance(data, dict) and "error" in data:
+            raise AiClientError(f"AI error: {data['error']}")
+        raise AiClientError("AI response missing choices/message/content")
+
+
 class OpenAIChatClient:
-    config: AiConfig
-
-    def chat(self, *, system: str, user: str, temperature: float = 0.2) -> str:
-        url = self._chat_completions_url(self.config.endpoint)
-
-        payload = {
-            "model": self.config.model,
-            "temperature": float(temperature),
-            "messages": [
-                {"role": "system", "content": system},
-                {"role": "user", "content": user},
-            ],
+    """Chat Completions client backed by a small pool of keep-alive HTTP(S) connections.
+
+    Reusing connections avoids a TCP + TLS handshake per request, which dominates
+    latency for the short Q&A exchanges. Each request checks a connection out of the
+    pool, so UI worker threads can talk to the endpoint concurrently.
+
+    A proxy configured through ``HTTP(S)_PROXY`` is honoured (HTTPS goes through a
+    ``CONNECT`` tunnel). Redirects are not followed: a 3xx answer raises
+    ``AiClientError`` naming the new location, which should be configured as the
+    endpoint instead.
+    """
+
+    __slots__ = (
+        "config",
+        "_headers",
+        "_idle",
+        "_lock",
+        "_max_idle",
+        "_proxy",
+        "_target",
+        "_target_error",
+    )
+
+    def __init__(self, config: AiConfig, *, max_idle_connections: int | None = None) -> None:
+        self.config = config
+        self._idle: list[HTTPConnection] = []
+        self._lock = threading.Lock()
+        if max_idle_connections is None:
+            max_idle_connections = config.max_connections
+        self._max_idle = max(1, int(max_idle_connections))
+        # The endpoint and key do not change for the lifetime of the client, so the
+        # request target and the static headers are resolved once here. An unusable
+        # endpoint is reported by `chat`, so constructing the client never fails.
+        self._target_error = ""
+        try:
+            self._target: tuple[str, str, str] | None = _split_target(
+                self._chat_completions_url(config.endpoint)
+            )
+        except AiClientError as exc:
+            self._target = None
+            self._target_error = str(exc)
+        self._headers = {
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {config.api_key}",
+            "Connection": "keep-alive",
         }
+        self._proxy: tuple[str, dict[str, str]] | None = None
+        if self._target is not None:
+            scheme, netloc, path = self._target
+            self._proxy = _resolve_proxy(scheme, netloc)
+            if self._proxy is not None and scheme == "http":
+                # Plain HTTP goes to the proxy itself with an absolute request target.
+                self._target = (scheme, netloc, f"http://{netloc}{path}")
+                self._headers.update(self._proxy[1])
+
+    def chat(
+        self,
+        *,
+        system: str,
+        user: str,
+        temperature: float = 0.2,
+        json_mode: bool = False,
+    ) -> str:
+        """Sends one chat completion request and returns the assistant message.
+
+        With ``json_mode`` the endpoint is asked for a JSON object response
+        (``response_format={"type": "json_object"}``).
+        """
+
+        target = self._target
+        if target is None:
+            raise AiClientError(self._target_error)
 
-        body = json.dumps(payload).encode("utf-8")
-        request = Request(
-            url,
-            data=body,
-            method="POST",
-            headers={
-                "Content-Type": "application/json",
-                "Authorization": f"Bearer {self.config.api_key}",
-            },
-        )
+        try:
+            body = _chat_body(self.config.model, float(temperature), system, user, json_mode)
+        except (TypeError, ValueError) as exc:
+            raise AiClientError(f"AI request could not be encoded: {exc}") from exc
 
         last_error: Exception | None = None
         max_retries = max(1, int(self.config.max_retries))
@@ -54,46 +273,121 @@ class OpenAIChatClient:
 
         for attempt in range(max_retries):
             try:
-                with urlopen(request, timeout=self.config.timeout_seconds) as response:
-                    raw = response.read().decode("utf-8", "replace")
-                last_error = None
-                break
-            except HTTPError as exc:
-                raw = exc.read().decode("utf-8", "replace") if hasattr(exc, "read") else str(exc)
-                if exc.code in {429, 500, 502, 503, 504} and attempt < max_retries - 1:
-                    last_error = AiClientError(f"AI HTTP error: {exc.code} {exc.reason} - {raw}")
-                    time.sleep(backoff)
-                    continue
-                raise AiClientError(f"AI HTTP error: {exc.code} {exc.reason} - {raw}") from exc
-            except (URLError, socket.timeout, TimeoutError) as exc:
-                last_error = AiClientError(f"AI request failed: {exc}")
-                if attempt < max_retries - 1:
-                    time.sleep(backoff)
-                    continue
-                raise last_error from exc
+                status, reason, raw, response = self._post(target, body)
             except Exception as exc:
                 last_error = AiClientError(f"AI request failed: {exc}")
                 if attempt < max_retries - 1:
-                    time.sleep(backoff)
+                    time.sleep(_retry_delay(attempt, backoff, status=None, retry_after=None))
                     continue
                 raise last_error from exc
 
+            if status >= 400:
+                text = raw.decode("utf-8", "replace")
+                error = AiClientError(f"AI HTTP error: {status} {reason} - {text}")
+                if status in _RETRY_STATUSES and attempt < max_retries - 1:
+                    last_error = error
+                    retry_after = response.getheader("Retry-After")
+                    time.sleep(_retry_delay(attempt, backoff, status=status, retry_after=retry_after))
+                    continue
+                raise error
+            if status >= 300:
+                location = response.getheader("Location") or "?"
+                raise AiClientError(
+                    f"AI endpoint redirected: {status} {reason} -> {location} "
+                    "(configure that URL as the endpoint)"
+                )
+
+            last_error = None
+            break
+
         if last_error is not None:
             raise last_error
 
-        try:
-            data: dict[str, Any] = json.loads(raw)
-        except Exception as exc:
-            raise AiClientError("AI returned invalid JSON") from exc
+        return _message_content(raw)
 
-        # OpenAI Chat Completions response shape
-        try:
-            return str(data["choices"][0]["message"]["content"])
-        except Exception:
-            # helpful fallback for non-standard but compatible shapes
-            if "error" in data:
-                raise AiClientError(f"AI error: {data['error']}")
-            raise AiClientError("AI response missing choices/message/content")
+    def chat_many(
+        self,
+        prompts: Iterable[tuple[str, str]],
+        *,
+        temperature: float = 0.2,
+        json_mode: bool = False,
+        max_workers: int | None = None,
+    ) -> list[str]:
+        """Sends several ``(system, user)`` prompts concurrently.
+
+        Requests share the keep-alive pool, so N prompts cost at most
+        ``max_workers`` handshakes instead of N round trips in series. Answers are
+        returned in prompt order; the first failure is re-raised.
+        """
+
+        prompts = list(prompts)
+        if not prompts:
+            return []
+
+        def send(prompt: tuple[str, str]) -> str:
+            system, user = prompt
+            return self.chat(system=system, user=user, temperature=temperature, json_mode=json_mode)
+
+        workers = min(len(prompts), max_workers or self._max_idle)
+        if workers <= 1:
+            return [send(prompt) for prompt in prompts]
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ai-chat") as pool:
+            return list(pool.map(send, prompts))
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+    def _post(
+        self, target: tuple[str, str, str], body: bytes
+    ) -> tuple[int, str, bytes, HTTPResponse]:
+        scheme, netloc, path = target
+
+        for retry_stale in (True, False):
+            conn, reused = self._checkout(scheme, netloc)
+            try:
+                conn.request("POST", path, body=body, headers=self._headers)
+                response = conn.getresponse()
+                raw = response.read()
+            except (HTTPException, ConnectionError):
+                conn.close()
+                if reused and retry_stale:
+                    # The server closed an idle keep-alive connection; reconnect once.
+                    continue
+                raise
+            except BaseException:
+                conn.close()
+                raise
+            break
+
+        if response.will_close:
+            conn.close()
+        else:
+            self._checkin(conn)
+
+        return response.status, response.reason, raw, response
+
+    def _checkout(self, scheme: str, netloc: str) -> tuple[HTTPConnection, bool]:
+        with self._lock:
+            if self._idle:
+                return self._idle.pop(), True
+        proxy = self._proxy
+        host = netloc if proxy is None else proxy[0]
+        if scheme == "http":
+            return HTTPConnection(host, timeout=self.config.timeout_seconds), False
+        conn = HTTPSConnection(host, timeout=self.config.timeout_seconds)
+        if proxy is not None:
+            conn.set_tunnel(netloc, headers=proxy[1])
+        return conn, False
+
+    def _checkin(self, conn: HTTPConnection) -> None:
+        with self._lock:
+            if len(self._idle) < self._max_idle:
+                self._idle.append(conn)
+                return
+        conn.close()
 
     @staticmethod
     def _chat_completions_url(endpoint: str) -> str:
@@ -101,9 +395,9 @@ class OpenAIChatClient:
         if not endpoint:
             raise AiClientError("Missing AI endpoint")
 
-        # If a full path is provided, use it.
+        # If a full path is provided, use it ("/v1/chat/completions" ends with this too).
         lowered = endpoint.lower()
-        if lowered.endswith("/v1/chat/completions") or lowered.endswith("/chat/completions"):
+        if lowered.endswith("/chat/completions"):
             return endpoint
 
         # If endpoint already ends with /v1, append the rest.
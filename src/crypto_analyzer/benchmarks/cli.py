@@ -56,6 +56,11 @@ def _build_parser() -> ArgumentParser:
         default=Path("test_assets") / "generated",
         help="Directory containing generated test images for FS benchmark (default: test_assets/generated)",
     )
+    parser.add_argument(
+        "--parallel",
+        action="store_true",
+        help="Run independent benchmarks in separate processes (worth it for large --sample-size/--seeds)",
+    )
     return parser
 
 
@@ -70,6 +75,7 @@ def main() -> int:
         seeds=args.seeds,
         seed_base=args.seed_base,
         images_dir=args.images_dir,
+        parallel=args.parallel,
     )
     written = write_report(report, output_dir=args.output_dir, stem=args.stem, formats=formats)
 
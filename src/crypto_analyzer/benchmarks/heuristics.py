@@ -6,7 +6,9 @@ The labels are synthetic ground-truth used for evaluation only.
 
 from __future__ import annotations
 
+from collections import Counter
 from dataclasses import asdict, dataclass
+from functools import lru_cache
 
 from crypto_analyzer.core.models import EncryptionStatus, FileSystemType, Volume
 from crypto_analyzer.crypto_detection import HeuristicEncryptionDetector
@@ -37,14 +39,21 @@ def _make_volume(data: bytes) -> Volume:
     return Volume(identifier="synthetic", offset=0, size=len(data), filesystem=FileSystemType.UNKNOWN)
 
 
-def _samples(*, size: int, seed: int) -> list[LabeledSample]:
-    # IMPORTANT: this is a *synthetic* truth label. For ambiguous categories, we label UNKNOWN.
-    return [
+# IMPORTANT: these are *synthetic* truth labels. For ambiguous categories, we label UNKNOWN.
+def _seed_samples(*, size: int, seed: int) -> tuple[LabeledSample, ...]:
+    return (
         LabeledSample(
             name="high_entropy_random",
             truth=EncryptionStatus.ENCRYPTED,
             data=deterministic_random_bytes(size, seed=seed),
         ),
+    )
+
+
+@lru_cache(maxsize=8)
+def _constant_samples(size: int) -> tuple[LabeledSample, ...]:
+    # Seed-independent samples: built once per size and shared (bytes are immutable).
+    return (
         LabeledSample(
             name="all_zeros",
             truth=EncryptionStatus.UNKNOWN,
@@ -55,7 +64,15 @@ def _samples(*, size: int, seed: int) -> list[LabeledSample]:
             truth=EncryptionStatus.NOT_DETECTED,
             data=repeat_byte(size, 0xAA),
         ),
-    ]
+    )
+
+
+def _predict(
+    detector: HeuristicEncryptionDetector, driver: InMemoryDriver, sample: LabeledSample
+) -> EncryptionStatus:
+    # The detector is stateless between calls; only the driver's backing data is swapped.
+    driver.data = sample.data
+    return detector.analyze_volume(_make_volume(sample.data)).status
 
 
 def _confusion_key(truth: EncryptionStatus, pred: EncryptionStatus) -> str:
@@ -66,32 +83,30 @@ def _safe_div(num: float, den: float) -> float:
     return 0.0 if den == 0.0 else num / den
 
 
+_ENCRYPTED = EncryptionStatus.ENCRYPTED.value
+_NON_ENCRYPTED = frozenset({EncryptionStatus.NOT_DETECTED.value, EncryptionStatus.UNKNOWN.value})
+
+
 def _compute_metrics(confusion: dict[str, int]) -> dict[str, float]:
     # Focus: evaluate ENCRYPTED detection quality.
-    tp = confusion.get("encrypted -> encrypted", 0)
-    fp = (
-        confusion.get("not_detected -> encrypted", 0)
-        + confusion.get("unknown -> encrypted", 0)
-    )
-    fn = (
-        confusion.get("encrypted -> not_detected", 0)
-        + confusion.get("encrypted -> unknown", 0)
-    )
+    # Single pass over the matrix; PARTIALLY_ENCRYPTED rows/columns are ignored.
+    tp = fp = fn = total_non_encrypted = 0
+    for key, count in confusion.items():
+        truth, _, pred = key.partition(" -> ")
+        if truth == _ENCRYPTED:
+            if pred == _ENCRYPTED:
+                tp += count
+            elif pred in _NON_ENCRYPTED:
+                fn += count
+        elif truth in _NON_ENCRYPTED:
+            if pred == _ENCRYPTED:
+                fp += count
+                total_non_encrypted += count
+            elif pred in _NON_ENCRYPTED:
+                total_non_encrypted += count
 
     precision = _safe_div(tp, tp + fp)
     recall = _safe_div(tp, tp + fn)
-
-    total_non_encrypted = sum(
-        confusion.get(k, 0)
-        for k in (
-            "not_detected -> encrypted",
-            "not_detected -> not_detected",
-            "not_detected -> unknown",
-            "unknown -> encrypted",
-            "unknown -> not_detected",
-            "unknown -> unknown",
-        )
-    )
     fp_rate_non_encrypted = _safe_div(fp, total_non_encrypted)
 
     return {
@@ -102,15 +117,25 @@ def _compute_metrics(confusion: dict[str, int]) -> dict[str, float]:
 
 
 def run_heuristic_benchmark(*, sample_size: int = 256 * 1024, seeds: int = 10, seed_base: int = 1337) -> HeuristicBenchmarkResult:
-    confusion: dict[str, int] = {}
+    confusion: Counter[str] = Counter()
+    size = int(sample_size)
+    driver = InMemoryDriver(b"")
+    detector = HeuristicEncryptionDetector(driver)
+
+    # The detector is deterministic, so seed-independent samples are classified once
+    # and their verdicts counted for every seed.
+    constant_keys = [
+        _confusion_key(sample.truth, _predict(detector, driver, sample))
+        for sample in _constant_samples(size)
+    ]
 
     for i in range(int(seeds)):
         seed = int(seed_base) + i
-        for sample in _samples(size=int(sample_size), seed=seed):
-            detector = HeuristicEncryptionDetector(InMemoryDriver(sample.data))
-            finding = detector.analyze_volume(_make_volume(sample.data))
-            key = _confusion_key(sample.truth, finding.status)
-            confusion[key] = confusion.get(key, 0) + 1
+        confusion.update(
+            _confusion_key(sample.truth, _predict(detector, driver, sample))
+            for sample in _seed_samples(size=size, seed=seed)
+        )
+        confusion.update(constant_keys)
 
     metrics = _compute_metrics(confusion)
 
@@ -118,6 +143,6 @@ def run_heuristic_benchmark(*, sample_size: int = 256 * 1024, seeds: int = 10, s
         name="heuristic_encryption",
         sample_size=int(sample_size),
         seeds=int(seeds),
-        confusion=confusion,
+        confusion=dict(confusion),
         metrics=metrics,
     )
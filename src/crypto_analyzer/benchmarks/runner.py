@@ -2,10 +2,15 @@
 
 from __future__ import annotations
 
+import io
 import json
+from collections.abc import Callable, Iterator
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from dataclasses import asdict, dataclass
 from datetime import datetime, timezone
 from pathlib import Path
+from typing import TextIO
 
 from crypto_analyzer.crypto_detection.signature_loader import load_default_signatures
 
@@ -13,6 +18,11 @@ from .filesystem import run_filesystem_benchmark
 from .heuristics import run_heuristic_benchmark
 from .signatures import run_signature_benchmark
 
+try:  # optional C-accelerated encoder; the stdlib json module is the fallback
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None  # type: ignore[assignment]
+
 
 @dataclass(frozen=True, slots=True)
 class BenchmarkReport:
@@ -20,47 +30,83 @@ class BenchmarkReport:
     benchmarks: list[dict]
 
     def to_json(self) -> str:
-        return json.dumps(asdict(self), ensure_ascii=False, indent=2)
+        return self.to_json_bytes().decode("utf-8")
+
+    def to_json_bytes(self) -> bytes:
+        """UTF-8 JSON (2-space indent), encoded straight from the dataclass when orjson is available."""
+
+        if orjson is not None:
+            return orjson.dumps(self, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        return json.dumps(asdict(self), ensure_ascii=False, indent=2).encode("utf-8")
 
     def to_markdown(self) -> str:
-        lines: list[str] = []
-        lines.append("# Benchmark Report")
-        lines.append("")
-        lines.append(f"Generated: {self.created_at}")
-        lines.append("")
+        buf = io.StringIO()
+        self.write_markdown(buf)
+        return buf.getvalue()
+
+    def write_markdown(self, fp: TextIO) -> None:
+        """Streams the Markdown report to `fp` line by line.
+
+        Output matches joining all lines with newlines, stripping trailing
+        whitespace and ending with a single newline.
+        """
+
+        # Lines from the last non-blank one onwards are held back, because
+        # trailing blank lines (and trailing whitespace) are trimmed at the end.
+        tail: list[str] = []
+        started = False
+        for line in self._markdown_lines():
+            if line.strip() and tail:
+                for done in tail:
+                    if started:
+                        fp.write("\n")
+                    fp.write(done)
+                    started = True
+                tail.clear()
+            tail.append(line)
+
+        rest = "\n".join(tail).rstrip()
+        if started and rest:
+            fp.write("\n")
+        fp.write(rest)
+        fp.write("\n")
+
+    def _markdown_lines(self) -> Iterator[str]:
+        yield "# Benchmark Report"
+        yield ""
+        yield f"Generated: {self.created_at}"
+        yield ""
 
         for bench in self.benchmarks:
             name = bench.get("name", "unknown")
             status = bench.get("status", "ok")
-            lines.append(f"## {name}")
-            lines.append("")
+            yield f"## {name}"
+            yield ""
 
             if status != "ok":
-                lines.append(f"Status: {status}")
+                yield f"Status: {status}"
                 reason = bench.get("reason")
                 if reason:
-                    lines.append(f"Reason: {reason}")
-                lines.append("")
+                    yield f"Reason: {reason}"
+                yield ""
 
             metrics = bench.get("metrics", {}) or {}
             if metrics:
-                lines.append("### Metrics")
+                yield "### Metrics"
                 for k in sorted(metrics):
                     v = metrics[k]
                     if isinstance(v, float):
-                        lines.append(f"- {k}: {v:.4f}")
+                        yield f"- {k}: {v:.4f}"
                     else:
-                        lines.append(f"- {k}: {v}")
-                lines.append("")
+                        yield f"- {k}: {v}"
+                yield ""
 
             confusion = bench.get("confusion", {}) or {}
             if confusion:
-                lines.append("### Confusion")
+                yield "### Confusion"
                 for k in sorted(confusion):
-                    lines.append(f"- {k}: {confusion[k]}")
-                lines.append("")
-
-        return "\n".join(lines).rstrip() + "\n"
+                    yield f"- {k}: {confusion[k]}"
+                yield ""
 
 
 def _ok(payload: dict) -> dict:
@@ -76,44 +122,72 @@ def _error(name: str, error: Exception) -> dict:
     return {"name": name, "status": "error", "reason": str(error), "metrics": {}, "confusion": {}}
 
 
-def run_all_benchmarks(
-    *,
-    sample_size: int = 256 * 1024,
-    seeds: int = 10,
-    seed_base: int = 1337,
-    images_dir: Path | None = None,
-) -> BenchmarkReport:
-    results: list[dict] = []
-
+def _signature_job() -> dict:
     try:
         sigs = load_default_signatures()
-        results.append(_ok(run_signature_benchmark(signatures=sigs).to_dict()))
+        return _ok(run_signature_benchmark(signatures=sigs).to_dict())
     except Exception as exc:  # pragma: no cover
-        results.append(_error("signature_magic_bytes", exc))
+        return _error("signature_magic_bytes", exc)
 
+
+def _heuristic_job(sample_size: int, seeds: int, seed_base: int) -> dict:
     try:
-        results.append(
-            _ok(
-                run_heuristic_benchmark(
-                    sample_size=sample_size,
-                    seeds=seeds,
-                    seed_base=seed_base,
-                ).to_dict()
-            )
+        return _ok(
+            run_heuristic_benchmark(
+                sample_size=sample_size,
+                seeds=seeds,
+                seed_base=seed_base,
+            ).to_dict()
         )
     except Exception as exc:  # pragma: no cover
-        results.append(_error("heuristic_encryption", exc))
+        return _error("heuristic_encryption", exc)
+
+
+def _filesystem_job(image: Path) -> dict:
+    try:
+        return _ok(run_filesystem_benchmark(image_path=image).to_dict())
+    except Exception as exc:  # pragma: no cover
+        return _error("filesystem_detection", exc)
+
+
+def run_all_benchmarks(
+    *,
+    sample_size: int = 256 * 1024,
+    seeds: int = 10,
+    seed_base: int = 1337,
+    images_dir: Path | None = None,
+    parallel: bool = False,
+) -> BenchmarkReport:
+    # Each slot is either a ready result or a (job, args) pair to run.
+    slots: list[dict | tuple[Callable[..., dict], tuple]] = [
+        (_signature_job, ()),
+        (_heuristic_job, (sample_size, seeds, seed_base)),
+    ]
 
     # Optional: filesystem detection benchmark depends on having a generated image.
     images_dir = Path(images_dir) if images_dir is not None else Path("test_assets") / "generated"
     image = images_dir / "multi_volume.img"
     if not image.exists():
-        results.append(_skipped("filesystem_detection", f"missing image: {image}"))
+        slots.append(_skipped("filesystem_detection", f"missing image: {image}"))
     else:
+        slots.append((_filesystem_job, (image,)))
+
+    jobs = [slot for slot in slots if isinstance(slot, tuple)]
+    outputs: list[dict] | None = None
+    if parallel and len(jobs) > 1:
+        # The benchmarks share no state and are CPU-bound, so separate processes
+        # let them run side by side instead of serialising on the GIL.
         try:
-            results.append(_ok(run_filesystem_benchmark(image_path=image).to_dict()))
-        except Exception as exc:  # pragma: no cover
-            results.append(_error("filesystem_detection", exc))
+            with ProcessPoolExecutor(max_workers=len(jobs)) as pool:
+                futures = [pool.submit(job, *args) for job, args in jobs]
+                outputs = [future.result() for future in futures]
+        except (OSError, BrokenProcessPool):  # pragma: no cover - restricted environments
+            outputs = None
+    if outputs is None:
+        outputs = [job(*args) for job, args in jobs]
+
+    done = iter(outputs)
+    results = [next(done) if isinstance(slot, tuple) else slot for slot in slots]
 
     created_at = datetime.now(timezone.utc).isoformat()
     return BenchmarkReport(created_at=created_at, benchmarks=results)
@@ -129,15 +203,25 @@ def write_report(
     output_dir = Path(output_dir)
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    written: list[Path] = []
+    writers: list[tuple[Path, Callable[[Path], None]]] = []
     if "json" in formats:
-        path = output_dir / f"{stem}.json"
-        path.write_text(report.to_json(), encoding="utf-8")
-        written.append(path)
+        writers.append((output_dir / f"{stem}.json", lambda path: path.write_bytes(report.to_json_bytes())))
 
     if "md" in formats:
-        path = output_dir / f"{stem}.md"
-        path.write_text(report.to_markdown(), encoding="utf-8")
-        written.append(path)
+        writers.append((output_dir / f"{stem}.md", lambda path: _write_markdown_file(report, path)))
+
+    if len(writers) > 1:
+        # Independent files: encode and write them concurrently so the I/O overlaps.
+        with ThreadPoolExecutor(max_workers=len(writers), thread_name_prefix="report-writer") as pool:
+            for future in [pool.submit(write, path) for path, write in writers]:
+                future.result()
+    else:
+        for path, write in writers:
+            write(path)
+
+    return [path for path, _ in writers]
+
 
-    return written
+def _write_markdown_file(report: BenchmarkReport, path: Path) -> None:
+    with path.open("w", encoding="utf-8") as fp:
+        report.write_markdown(fp)
@@ -10,6 +10,7 @@ Scope
 
 from __future__ import annotations
 
+from collections import Counter
 from dataclasses import asdict, dataclass
 
 from crypto_analyzer.core.models import EncryptionStatus, FileSystemType, Volume
@@ -69,17 +70,18 @@ def _safe_div(num: float, den: float) -> float:
 def run_signature_benchmark(*, signatures: list[EncryptionSignature] | None = None) -> SignatureBenchmarkResult:
     sigs = list(signatures or load_default_signatures())
 
-    confusion: dict[str, int] = {}
+    confusion: Counter[str] = Counter()
     passed = 0
     failed = 0
+    driver = InMemoryDriver(b"")
 
     for sig in sigs:
         # Build a buffer that covers read_offset + max_read.
         size = int(sig.read_offset) + int(sig.max_read)
-        buf = bytearray(b"\x00" * size)
+        buf = bytearray(size)
         _place_matchers(buf, signature=sig)
 
-        driver = InMemoryDriver(bytes(buf))
+        driver.data = memoryview(buf).toreadonly()
         detector = SignatureBasedDetector(driver=driver, signatures=[sig])
         finding = detector.analyze_volume(_make_volume(len(buf)))
 
@@ -87,7 +89,7 @@ def run_signature_benchmark(*, signatures: list[EncryptionSignature] | None = No
         detected_id = sig.identifier if ok else None
 
         key = _confusion_key(sig.identifier, detected_id)
-        confusion[key] = confusion.get(key, 0) + 1
+        confusion[key] += 1
 
         if ok:
             passed += 1
@@ -102,6 +104,6 @@ def run_signature_benchmark(*, signatures: list[EncryptionSignature] | None = No
         samples=samples,
         passed=passed,
         failed=failed,
-        confusion=confusion,
+        confusion=dict(confusion),
         metrics={"accuracy": float(accuracy)},
     )
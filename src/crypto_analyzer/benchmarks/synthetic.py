@@ -12,11 +12,14 @@ from crypto_analyzer.drivers import DriverError
 
 
 def deterministic_random_bytes(length: int, *, seed: int) -> bytes:
+    # Both paths draw the whole buffer from one C-level getrandbits() call;
+    # the per-byte generator fallback was interpreter-bound.
+    length = int(length)
     rng = random.Random(seed)
     try:
-        return rng.randbytes(int(length))  # py3.9+
+        return rng.randbytes(length)  # py3.9+
     except AttributeError:  # pragma: no cover
-        return bytes(rng.getrandbits(8) for _ in range(int(length)))
+        return rng.getrandbits(length * 8).to_bytes(length, "little") if length else b""
 
 
 def zeros(length: int) -> bytes:
@@ -29,13 +32,22 @@ def repeat_byte(length: int, value: int) -> bytes:
 
 @dataclass(slots=True)
 class InMemoryDriver:
-    """Minimal driver-like object that supports raw reads."""
+    """Minimal driver-like object that supports raw reads.
 
-    data: bytes
+    `data` may be a (read-only) memoryview over a mutable buffer, so callers can
+    wrap a bytearray without copying it first.
+    """
+
+    data: bytes | memoryview
 
     def read(self, offset: int, size: int) -> bytes:
+        return bytes(self.read_view(offset, size))
+
+    def read_view(self, offset: int, size: int) -> memoryview:
+        """Zero-copy, read-only view of the requested window (same bounds rules as `read`)."""
+
         start = max(int(offset), 0)
         end = max(start + int(size), start)
         if start > len(self.data):
             raise DriverError("read out of bounds")
-        return self.data[start:end]
+        return memoryview(self.data).toreadonly()[start:end]
@@ -4,20 +4,58 @@ from __future__ import annotations
 
 import sys
 from argparse import ArgumentParser, Namespace
+from functools import cache
+from importlib import import_module
 from pathlib import Path
+from typing import TYPE_CHECKING, Any
 
 import structlog
 
-from crypto_analyzer.core import AnalysisManager
-from crypto_analyzer.crypto_detection import HeuristicEncryptionDetector, SignatureBasedDetector
-from crypto_analyzer.drivers import TskImageDriver, TskPhysicalDiskDriver
-from crypto_analyzer.fs_detection import TskFileSystemDetector
-from crypto_analyzer.metadata import TskMetadataScanner
-from crypto_analyzer.reporting import DefaultReportExporter, ExportFormat
 from crypto_analyzer.shared import configure_logging
 
+if TYPE_CHECKING:
+    from crypto_analyzer.core import AnalysisManager
+    from crypto_analyzer.core.detection_cache import DetectionCache
+    from crypto_analyzer.drivers import TskImageDriver, TskPhysicalDiskDriver
 
+# Komponenty ładowane dopiero, gdy dana ścieżka wykonania ich potrzebuje: import
+# modułu CLI (i `--help`) nie ładuje pytsk3 ani warstwy analizy, a `--list-physical`
+# tylko sterowniki.
+_LAZY_IMPORTS = {
+    "AnalysisManager": "crypto_analyzer.core",
+    "TskImageDriver": "crypto_analyzer.drivers",
+    "TskPhysicalDiskDriver": "crypto_analyzer.drivers",
+    "SignatureBasedDetector": "crypto_analyzer.crypto_detection",
+    "HeuristicEncryptionDetector": "crypto_analyzer.crypto_detection",
+    "TskFileSystemDetector": "crypto_analyzer.fs_detection",
+    "TskMetadataScanner": "crypto_analyzer.metadata",
+    "DefaultReportExporter": "crypto_analyzer.reporting",
+    "ExportFormat": "crypto_analyzer.reporting",
+    "DetectionCache": "crypto_analyzer.core.detection_cache",
+}
+
+
+def _lazy(name: str) -> Any:
+    """Zwraca komponent z przestrzeni modułu (np. podmieniony w testach) lub importuje go."""
+
+    try:
+        return globals()[name]
+    except KeyError:
+        value = getattr(import_module(_LAZY_IMPORTS[name]), name)
+        globals()[name] = value
+        return value
+
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY_IMPORTS:
+        return _lazy(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+@cache
 def _build_parser() -> ArgumentParser:
+    # Parser jest budowany raz na proces (np. przy wielokrotnym `main()` w testach
+    # lub osadzeniu); `parse_args` nie modyfikuje jego stanu.
     parser = ArgumentParser(
         prog="crypto-analyzer",
         description="Narzędzie do analizy dysków i obrazów dysków pod kątem szyfrowania.",
@@ -71,6 +109,40 @@ def _build_parser() -> ArgumentParser:
             'Przykład: --signature-id bitlocker --signature-id veracrypt; brak parametru = wszystkie.'
         ),
     )
+    parser.add_argument(
+        "--volume-workers",
+        type=int,
+        default=1,
+        help="Liczba wolumenów analizowanych równolegle (domyślnie: 1)",
+    )
+    parser.add_argument(
+        "--detection-cache",
+        nargs="?",
+        const=True,
+        default=None,
+        metavar="PATH",
+        help=(
+            "Zapamiętuje wyniki detekcji FS/szyfrowania między uruchomieniami "
+            "(opcjonalnie ścieżka do bazy; domyślnie katalog cache użytkownika)"
+        ),
+    )
+    parser.add_argument(
+        "--staging-file",
+        type=Path,
+        metavar="PATH",
+        help=(
+            "Odkłada drzewa metadanych ukończonych wolumenów do pliku pośredniego "
+            "zamiast trzymać je w pamięci do eksportu (plik jest usuwany po zakończeniu)"
+        ),
+    )
+    parser.add_argument(
+        "--skip-encryption-on-unknown-fs",
+        action="store_true",
+        help=(
+            "Nie uruchamia detektorów szyfrowania dla wolumenów o nierozpoznanym systemie plików "
+            "(szybciej, ale BitLocker/VeraCrypt na takich wolumenach nie zostaną wykryte)"
+        ),
+    )
     parser.add_argument(
         "--verbose",
         action="store_true",
@@ -82,10 +154,11 @@ def _build_parser() -> ArgumentParser:
 def _run_analysis(args: Namespace) -> int:
     logger = structlog.get_logger(__name__)
     manager: AnalysisManager | None = None
+    detection_cache: DetectionCache | None = None
     driver: TskImageDriver | TskPhysicalDiskDriver | None = None
 
     if args.source_type == "physical" and args.list_physical:
-        driver = TskPhysicalDiskDriver()
+        driver = _lazy("TskPhysicalDiskDriver")()
         try:
             sources = list(driver.enumerate_sources())
             if not sources:
@@ -110,31 +183,38 @@ def _run_analysis(args: Namespace) -> int:
         if not image_path.exists():
             logger.error("image-not-found", path=str(image_path))
             return 1
-        driver = TskImageDriver(image_paths=[image_path])
+        driver = _lazy("TskImageDriver")(image_paths=[image_path])
     else:
         if args.source is None:
             logger.error("physical-device-not-provided")
             return 1
         device_path = args.source
-        driver = TskPhysicalDiskDriver(device_paths=[device_path])
+        driver = _lazy("TskPhysicalDiskDriver")(device_paths=[device_path])
 
     try:
-        fs_detector = TskFileSystemDetector(driver)
+        fs_detector = _lazy("TskFileSystemDetector")(driver)
 
         signature_ids = tuple(args.signature_ids) if getattr(args, "signature_ids", None) else None
         crypto_detectors = [
-            SignatureBasedDetector(driver, signature_ids=signature_ids),
-            HeuristicEncryptionDetector(driver),
+            _lazy("SignatureBasedDetector")(driver, signature_ids=signature_ids),
+            _lazy("HeuristicEncryptionDetector")(driver),
         ]
-        metadata_scanner = TskMetadataScanner(driver, max_depth=args.max_depth)
-        exporter = DefaultReportExporter()
+        metadata_scanner = _lazy("TskMetadataScanner")(driver, max_depth=args.max_depth)
+        exporter = _lazy("DefaultReportExporter")()
+        if args.detection_cache:
+            cache_path = None if args.detection_cache is True else Path(args.detection_cache)
+            detection_cache = _lazy("DetectionCache")(cache_path)
 
-        manager = AnalysisManager(
+        manager = _lazy("AnalysisManager")(
             driver=driver,
             filesystem_detector=fs_detector,
             encryption_detectors=crypto_detectors,
             metadata_scanner=metadata_scanner,
             report_exporter=exporter,
+            max_workers=args.volume_workers,
+            detection_cache=detection_cache,
+            staging_path=args.staging_file,
+            skip_encryption_on_unknown_fs=args.skip_encryption_on_unknown_fs,
         )
 
         source_label = str(args.source) if args.source else "auto"
@@ -158,14 +238,16 @@ def _run_analysis(args: Namespace) -> int:
         logger.info("analyzing-volumes", count=len(volume_ids))
         result = manager.analyze(volume_ids, collect_metadata=not args.skip_metadata)
 
-        fmt = ExportFormat.JSON if args.format == "json" else ExportFormat.CSV
+        export_format = _lazy("ExportFormat")
+        fmt = export_format.JSON if args.format == "json" else export_format.CSV
         output_path = manager.export_report(result, args.output, fmt)
 
+        total_files, total_directories = result.totals()
         logger.info(
             "analysis-complete",
             volumes=len(result.volumes),
-            files=result.total_files(),
-            directories=result.total_directories(),
+            files=total_files,
+            directories=total_directories,
             report=str(output_path),
         )
         return 0
@@ -178,6 +260,8 @@ def _run_analysis(args: Namespace) -> int:
             manager.close()
         elif driver is not None:
             driver.close()
+        if detection_cache is not None:
+            detection_cache.close()
 
 
 def main() -> int:
@@ -2,7 +2,10 @@
 
 from __future__ import annotations
 
+import queue
 import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Iterable, Sequence
@@ -23,15 +26,25 @@ from crypto_analyzer.fs_detection import FileSystemDetector
 from crypto_analyzer.drivers import DataSourceDriver
 from crypto_analyzer.metadata import MetadataResult, MetadataScanCancelled, MetadataScanner
 from crypto_analyzer.reporting import ExportFormat, ReportExporter
+from .detection_cache import DetectionCache, ruleset_fingerprint
 from .session import AnalysisSession
+from .staging import MetadataStaging
 from .tasks import ProgressReporter
 
+# Wspólny logger modułu - leniwy proxy structlog, rozwiązywany przy pierwszym użyciu.
+_LOGGER: BoundLogger = structlog.get_logger(__name__)
+
+# Minimalny odstęp (s) między komunikatami postępu skanowania metadanych.
+_METADATA_PROGRESS_INTERVAL = 0.1
+# Jak często (s) wątek wywołujący opróżnia kolejkę postępu przy analizie równoległej.
+_PROGRESS_DRAIN_INTERVAL = 0.05
+
 
 @dataclass
 class DefaultProgressReporter:
     """Prosty reporter postępu logujący zdarzenia do konsoli."""
 
-    logger: BoundLogger = field(default_factory=lambda: structlog.get_logger(__name__))
+    logger: BoundLogger = field(default_factory=lambda: _LOGGER)
 
     def update(self, message: str, *, percentage: int | None = None) -> None:
         if percentage is not None:
@@ -65,6 +78,10 @@ class AnalysisManager:
         metadata_scanner: MetadataScanner,
         report_exporter: ReportExporter,
         progress_reporter: ProgressReporter | None = None,
+        max_workers: int = 1,
+        detection_cache: DetectionCache | None = None,
+        staging_path: Path | None = None,
+        skip_encryption_on_unknown_fs: bool = False,
     ) -> None:
         self._driver = driver
         self._filesystem_detector = filesystem_detector
@@ -72,8 +89,27 @@ class AnalysisManager:
         self._metadata_scanner = metadata_scanner
         self._report_exporter = report_exporter
         self._progress_reporter = progress_reporter or DefaultProgressReporter()
-        self._logger = structlog.get_logger(__name__)
+        self._max_workers = max(1, max_workers)
+        self._detection_cache = detection_cache
+        # Uwaga: wolumeny BitLocker/VeraCrypt zwykle mają nierozpoznany FS - przy
+        # włączonej opcji ich szyfrowanie nie zostanie wykryte.
+        self._skip_encryption_on_unknown_fs = skip_encryption_on_unknown_fs
+        # Przy analizie równoległej komunikaty postępu z wątków roboczych trafiają do
+        # kolejki opróżnianej w wątku wywołującym `analyze` (zob. `_progress`).
+        self._progress_queue: queue.SimpleQueue[tuple[str, int | None]] | None = None
+        self._progress_high = 0
+        # Przy ustawionej ścieżce drzewa metadanych trafiają na dysk zaraz po skanie wolumenu.
+        # Plik należy do wyników, które go wskazują (zob. `core.staging`).
+        self._staging = MetadataStaging(staging_path) if staging_path is not None else None
+        self._ruleset = (
+            ruleset_fingerprint([filesystem_detector, *self._encryption_detectors])
+            if detection_cache is not None
+            else ""
+        )
+        self._logger = _LOGGER
         self._session: AnalysisSession | None = None
+        # Wyniki detektorów w bieżącej sesji: (identyfikator wolumenu, indeks detektora) -> wynik.
+        self._findings: dict[tuple[str, int], EncryptionFinding] = {}
 
     def start_session(self, source: DiskSource) -> AnalysisSession:
         """Inicjuje sesję analizy dla wskazanego źródła."""
@@ -82,6 +118,7 @@ class AnalysisManager:
         self._driver.open_source(source)
         volumes = list(self._driver.list_volumes())
         self._session = AnalysisSession(source=source, volumes=volumes)
+        self._findings.clear()
         self._progress(f"Wykryto {len(volumes)} wolumen(y)", percentage=15)
         return self._session
 
@@ -93,10 +130,15 @@ class AnalysisManager:
         return self._session
 
     def close(self) -> None:
-        """Kończy pracę z bieżącym sterownikiem."""
+        """Kończy pracę z bieżącym sterownikiem.
+
+        Plik pośredni metadanych nie jest tu usuwany - wskazują go zwrócone wyniki
+        (`VolumeAnalysis.staged_metadata`); znika, gdy przestaną być używane.
+        """
 
         self._driver.close()
         self._session = None
+        self._findings.clear()
 
     def analyze(
         self,
@@ -108,84 +150,184 @@ class AnalysisManager:
         """Analizuje wybrane wolumeny i zwraca wyniki."""
 
         session = self.session()
-        selected_volumes = [volume for volume in session.volumes if volume.identifier in set(volume_ids)]
+        selected_ids = set(volume_ids)
+        selected_volumes = [volume for volume in session.volumes if volume.identifier in selected_ids]
         if not selected_volumes:
             raise ValueError("Brak wybranych wolumenów do analizy")
 
-        analysis = AnalysisResult(source=session.source)
+        total = len(selected_volumes)
+        # Wyniki zapisujemy pod indeksem wolumenu - kolejność nie zależy od trybu pracy.
+        results: list[VolumeAnalysis | None] = [None] * total
+
+        if self._max_workers > 1 and total > 1:
+            # Wolumeny są niezależne - analizujemy je równolegle, zachowując kolejność wyników.
+            # Wątki współdzielą sterownik: odczyty pytsk3.Img_Info są w TSK chronione
+            # blokadą pamięci podręcznej obrazu (z tego korzysta też równoległy skaner
+            # metadanych), każdy wątek otwiera własny FS_Info, a detektory nie mają
+            # stanu zależnego od wolumenu. Postęp raportuje wyłącznie wątek wywołujący.
+            events: queue.SimpleQueue[tuple[str, int | None]] = queue.SimpleQueue()
+            self._progress_high = 0
+            self._progress_queue = events
+            try:
+                with ThreadPoolExecutor(max_workers=min(self._max_workers, total)) as executor:
+                    futures = [
+                        executor.submit(
+                            self._analyze_volume,
+                            volume,
+                            *self._progress_bounds(index, total),
+                            collect_metadata=collect_metadata,
+                            cancel_event=cancel_event,
+                        )
+                        for index, volume in enumerate(selected_volumes, start=1)
+                    ]
+                    pending = set(futures)
+                    try:
+                        while pending:
+                            done, pending = wait(
+                                pending,
+                                timeout=_PROGRESS_DRAIN_INTERVAL,
+                                return_when=FIRST_COMPLETED,
+                            )
+                            self._drain_progress(events)
+                            for future in done:
+                                future.result()
+                    except BaseException:
+                        for future in futures:
+                            future.cancel()
+                        raise
+                    for position, future in enumerate(futures):
+                        results[position] = future.result()
+            finally:
+                self._progress_queue = None
+                self._drain_progress(events)
+        else:
+            for index, volume in enumerate(selected_volumes, start=1):
+                start, end = self._progress_bounds(index, total)
+                results[index - 1] = self._analyze_volume(
+                    volume,
+                    start,
+                    end,
+                    collect_metadata=collect_metadata,
+                    cancel_event=cancel_event,
+                )
 
-        for index, volume in enumerate(selected_volumes, start=1):
-            self._check_cancel(cancel_event)
-            start, end = self._progress_bounds(index, len(selected_volumes))
-            self._progress(f"Wolumen {volume.identifier}: przygotowanie", percentage=start)
+        self._progress("Analiza zakończona", percentage=95)
+        return AnalysisResult(source=session.source, volumes=results)  # type: ignore[arg-type]
 
+    def _analyze_volume(
+        self,
+        volume: Volume,
+        start: int,
+        end: int,
+        *,
+        collect_metadata: bool,
+        cancel_event: threading.Event | None,
+    ) -> VolumeAnalysis:
+        """Wykrywa FS i szyfrowanie oraz (opcjonalnie) skanuje metadane jednego wolumenu."""
+
+        self._check_cancel(cancel_event)
+        self._progress(f"Wolumen {volume.identifier}: przygotowanie", percentage=start)
+
+        cache_key = self._detection_cache_key(volume)
+        cached = self._detection_cache.get(cache_key) if cache_key is not None else None
+        if cached is not None:
+            filesystem = cached.filesystem
+            finding = cached.encryption
+            volume.filesystem = filesystem
+            volume.encryption = finding.status
+            self._progress(f"Wolumen {volume.identifier}: wynik detekcji z pamięci podręcznej", percentage=start)
+        else:
             filesystem = self._detect_filesystem(volume)
 
-            self._progress(f"Wolumen {volume.identifier}: analiza szyfrowania", percentage=start)
-            finding = self._detect_encryption(volume)
-            metadata: MetadataResult | None = None
-            skip_metadata = filesystem is FileSystemType.UNKNOWN or finding.status in {
-                EncryptionStatus.ENCRYPTED,
-                EncryptionStatus.PARTIALLY_ENCRYPTED,
-            }
-
-            if collect_metadata and not skip_metadata:
-                self._check_cancel(cancel_event)
-                self._progress(f"Wolumen {volume.identifier}: skanowanie metadanych", percentage=start)
+            if filesystem is FileSystemType.UNKNOWN and self._skip_encryption_on_unknown_fs:
+                finding = EncryptionFinding(status=EncryptionStatus.UNKNOWN)
+                volume.encryption = finding.status
+                self._progress(
+                    f"Wolumen {volume.identifier}: analiza szyfrowania pominięta (nieznany system plików)",
+                    percentage=start,
+                )
+            else:
+                self._progress(f"Wolumen {volume.identifier}: analiza szyfrowania", percentage=start)
+                finding = self._detect_encryption(volume)
+                # Do cache trafiają tylko pełne wyniki - pominięta detekcja nie może
+                # przesłonić prawdziwego wyniku przy kolejnym uruchomieniu bez opcji.
+                if cache_key is not None:
+                    self._detection_cache.put(cache_key, filesystem, finding)
+        metadata: MetadataResult | None = None
+        skip_metadata = filesystem is FileSystemType.UNKNOWN or finding.status in {
+            EncryptionStatus.ENCRYPTED,
+            EncryptionStatus.PARTIALLY_ENCRYPTED,
+        }
+
+        if collect_metadata and not skip_metadata:
+            self._check_cancel(cancel_event)
+            self._progress(f"Wolumen {volume.identifier}: skanowanie metadanych", percentage=start)
 
-                def _metadata_progress(percent: int, kind: str | None, path: str | None) -> None:
-                    self._check_cancel(cancel_event)
-                    interpolated = self._interpolate_progress(start, end, percent)
-                    detail = self._format_metadata_detail(kind, path)
-                    message = f"Wolumen {volume.identifier}: skanowanie metadanych ({percent}%)"
-                    if detail:
-                        message = f"{message}\n{detail}"
-                    self._progress(message, percentage=interpolated)
+            last_emit = 0.0
+            last_percent = -1
 
-                try:
-                    metadata = self._metadata_scanner.scan(
-                        volume,
-                        progress=_metadata_progress,
-                        cancel_event=cancel_event,
-                    )
-                except MetadataScanCancelled as exc:
-                    raise AnalysisCancelledError("Analiza przerwana podczas skanowania metadanych") from exc
-                except Exception as exc:  # pragma: no cover - zależne od środowiska / uszkodzone obrazy
-                    self._logger.warning(
-                        "metadata-scan-failed",
-                        volume=volume.identifier,
-                        filesystem=filesystem.value,
-                        error=str(exc),
-                    )
-                    metadata = None
+            def _metadata_progress(percent: int, kind: str | None, path: str | None) -> None:
+                nonlocal last_emit, last_percent
                 self._check_cancel(cancel_event)
-                self._progress(f"Wolumen {volume.identifier}: analiza zakończona", percentage=end)
-            else:
-                self._check_cancel(cancel_event)
-                if skip_metadata:
-                    if filesystem is FileSystemType.UNKNOWN and finding.status in {
-                        EncryptionStatus.NOT_DETECTED,
-                        EncryptionStatus.UNKNOWN,
-                    }:
-                        reason = "nieznany system plików"
-                    else:
-                        algorithm = finding.algorithm or "szyfrowanie"
-                        reason = f"wykryto {algorithm}"
-                    self._progress(f"Wolumen {volume.identifier}: metadane pominięte ({reason})", percentage=end)
-                else:
-                    self._progress(f"Wolumen {volume.identifier}: analiza zakończona", percentage=end)
-
-            analysis.volumes.append(
-                VolumeAnalysis(
-                    volume=volume,
-                    filesystem=filesystem,
-                    encryption=finding,
-                    metadata=metadata,
+                # Skaner woła callback dla każdego pliku; raportujemy tylko zmianę
+                # procentu lub co `_METADATA_PROGRESS_INTERVAL` s (100% zawsze).
+                now = time.monotonic()
+                if percent < 100 and percent == last_percent and now - last_emit < _METADATA_PROGRESS_INTERVAL:
+                    return
+                last_emit = now
+                last_percent = percent
+                interpolated = self._interpolate_progress(start, end, percent)
+                detail = self._format_metadata_detail(kind, path)
+                message = f"Wolumen {volume.identifier}: skanowanie metadanych ({percent}%)"
+                if detail:
+                    message = f"{message}\n{detail}"
+                self._progress(message, percentage=interpolated)
+
+            try:
+                metadata = self._metadata_scanner.scan(
+                    volume,
+                    progress=_metadata_progress,
+                    cancel_event=cancel_event,
+                )
+            except MetadataScanCancelled as exc:
+                raise AnalysisCancelledError("Analiza przerwana podczas skanowania metadanych") from exc
+            except Exception as exc:  # pragma: no cover - zależne od środowiska / uszkodzone obrazy
+                self._logger.warning(
+                    "metadata-scan-failed",
+                    volume=volume.identifier,
+                    filesystem=filesystem.value,
+                    error=str(exc),
                 )
-            )
+                metadata = None
+            self._check_cancel(cancel_event)
+            self._progress(f"Wolumen {volume.identifier}: analiza zakończona", percentage=end)
+        else:
+            self._check_cancel(cancel_event)
+            if skip_metadata:
+                if filesystem is FileSystemType.UNKNOWN and finding.status in {
+                    EncryptionStatus.NOT_DETECTED,
+                    EncryptionStatus.UNKNOWN,
+                }:
+                    reason = "nieznany system plików"
+                else:
+                    algorithm = finding.algorithm or "szyfrowanie"
+                    reason = f"wykryto {algorithm}"
+                self._progress(f"Wolumen {volume.identifier}: metadane pominięte ({reason})", percentage=end)
+            else:
+                self._progress(f"Wolumen {volume.identifier}: analiza zakończona", percentage=end)
 
-        self._progress("Analiza zakończona", percentage=95)
-        return analysis
+        staged = None
+        if metadata is not None and self._staging is not None:
+            staged = self._staging.stash(metadata)
+            metadata = None
+
+        return VolumeAnalysis(
+            volume=volume,
+            filesystem=filesystem,
+            encryption=finding,
+            metadata=metadata,
+            staged_metadata=staged,
+        )
 
     def export_report(self, result: AnalysisResult, destination: Path, fmt: ExportFormat) -> Path:
         """Eksportuje raport do wskazanego pliku."""
@@ -194,6 +336,22 @@ class AnalysisManager:
         self._progress("Raport został zapisany", percentage=100)
         return path
 
+    def _detection_cache_key(self, volume: Volume) -> str | None:
+        if self._detection_cache is None or self._session is None:
+            return None
+        regions: list[tuple[int, int]] = []
+        for detector in self._encryption_detectors:
+            sample_regions = getattr(detector, "sample_regions", None)
+            if sample_regions is not None:
+                regions.extend(sample_regions(volume))
+        return self._detection_cache.key_for(
+            self._driver,
+            self._session.source,
+            volume,
+            ruleset=self._ruleset,
+            regions=regions,
+        )
+
     def _detect_filesystem(self, volume: Volume) -> FileSystemType:
         try:
             fs_type = self._filesystem_detector.detect(volume)
@@ -206,17 +364,22 @@ class AnalysisManager:
 
     def _detect_encryption(self, volume: Volume) -> EncryptionFinding:
         fallback: EncryptionFinding | None = None
-        for detector in self._encryption_detectors:
-            try:
-                finding = detector.analyze_volume(volume)
-            except Exception as exc:  # pragma: no cover - logowanie błędów środowiskowych
-                self._logger.warning(
-                    "encryption-detection-failed",
-                    volume=volume.identifier,
-                    detector=getattr(detector, "name", detector.__class__.__name__),
-                    error=str(exc),
-                )
-                continue
+        for position, detector in enumerate(self._encryption_detectors):
+            # Ponowna analiza wolumenu w tej samej sesji nie uruchamia detektora drugi raz.
+            key = (volume.identifier, position)
+            finding = self._findings.get(key)
+            if finding is None:
+                try:
+                    finding = detector.analyze_volume(volume)
+                except Exception as exc:  # pragma: no cover - logowanie błędów środowiskowych
+                    self._logger.warning(
+                        "encryption-detection-failed",
+                        volume=volume.identifier,
+                        detector=getattr(detector, "name", detector.__class__.__name__),
+                        error=str(exc),
+                    )
+                    continue
+                self._findings[key] = finding
 
             if finding.status in {EncryptionStatus.ENCRYPTED, EncryptionStatus.PARTIALLY_ENCRYPTED}:
                 volume.encryption = finding.status
@@ -232,19 +395,40 @@ class AnalysisManager:
         return result
 
     def _progress(self, message: str, *, percentage: int | None = None) -> None:
+        events = self._progress_queue
+        if events is not None:
+            events.put((message, percentage))
+            return
         self._progress_reporter.update(message, percentage=percentage)
 
+    def _drain_progress(self, events: queue.SimpleQueue[tuple[str, int | None]]) -> None:
+        """Przekazuje zebrane komunikaty reporterowi (w wątku wywołującym `analyze`).
+
+        Wolumeny przetwarzane równolegle raportują własne zakresy procentów, więc
+        wartości są wyrównywane w górę - pasek postępu nigdy się nie cofa.
+        """
+
+        while True:
+            try:
+                message, percentage = events.get_nowait()
+            except queue.Empty:
+                return
+            if percentage is not None:
+                percentage = max(percentage, self._progress_high)
+                self._progress_high = percentage
+            self._progress_reporter.update(message, percentage=percentage)
+
     @staticmethod
     def _progress_percentage(current: int, total: int) -> int:
         if total == 0:
             return 50
-        return int((current / total) * 80) + 15
+        return (current * 80) // total + 15
 
     @staticmethod
     def _interpolate_progress(start: int, end: int, percent: int) -> int:
         span = max(end - start, 1)
         clamped = max(0, min(percent, 100))
-        return start + int((clamped / 100) * span)
+        return start + (clamped * span) // 100
 
     @staticmethod
     def _progress_bounds(index: int, total: int) -> tuple[int, int]:
@@ -0,0 +1,182 @@
+"""Trwała pamięć podręczna wyników detekcji systemu plików i szyfrowania.
+
+Powtórna analiza tego samego obrazu nie musi ponownie uruchamiać detektorów:
+wynik jest zapisywany w bazie SQLite pod kluczem złożonym z identyfikatorów
+źródła i wolumenu, rozmiaru/czasu modyfikacji pliku źródłowego, skrótu
+nagłówka wolumenu i obszarów próbkowanych przez detektory (np. środka i końca
+wolumenu dla heurystyki entropii) oraz "wersji reguł" (odcisku modułów detektorów).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import sqlite3
+import sys
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable
+
+from crypto_analyzer.crypto_detection import EncryptionFinding
+from crypto_analyzer.drivers import DataSourceDriver, DriverError
+
+from .models import DiskSource, EncryptionStatus, FileSystemType, Volume
+
+HEADER_SAMPLE_SIZE = 64 * 1024
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS detections (
+    key TEXT PRIMARY KEY,
+    filesystem TEXT NOT NULL,
+    status TEXT NOT NULL,
+    algorithm TEXT,
+    version TEXT,
+    details TEXT
+)
+"""
+
+
+@dataclass(frozen=True, slots=True)
+class CachedDetection:
+    """Zapamiętany wynik detekcji jednego wolumenu."""
+
+    filesystem: FileSystemType
+    encryption: EncryptionFinding
+
+
+def default_cache_path() -> Path:
+    """Domyślna lokalizacja bazy (`CRYPTOANALYZER_CACHE_DIR` nadpisuje katalog)."""
+
+    override = (os.getenv("CRYPTOANALYZER_CACHE_DIR") or "").strip()
+    if override:
+        base = Path(override)
+    elif os.name == "nt":
+        root = os.getenv("LOCALAPPDATA") or os.getenv("APPDATA") or str(Path.home())
+        base = Path(root) / "CryptoAnalyzer" / "cache"
+    else:
+        base = Path.home() / ".crypto_analyzer" / "cache"
+    return base / "detect.db"
+
+
+def ruleset_fingerprint(components: Iterable[object]) -> str:
+    """Odcisk klas detektorów, czasów modyfikacji ich modułów i ich konfiguracji.
+
+    Zmiana kodu detektora unieważnia wpisy. Konfigurację (wybrane sygnatury wraz
+    ze skrótem pliku, z którego je wczytano, progi heurystyki) dostarcza
+    `config_fingerprint()` detektora, jeśli go udostępnia.
+    """
+
+    digest = hashlib.blake2b(digest_size=16)
+    for component in components:
+        cls = component if isinstance(component, type) else type(component)
+        digest.update(f"{cls.__module__}.{cls.__qualname__}".encode("utf-8"))
+        config_fingerprint = getattr(component, "config_fingerprint", None)
+        if config_fingerprint is not None and not isinstance(component, type):
+            digest.update(f"|{config_fingerprint()}|".encode("utf-8"))
+        module = sys.modules.get(cls.__module__)
+        module_file = getattr(module, "__file__", None)
+        if module_file:
+            try:
+                module_dir = Path(module_file).parent
+                for path in sorted(module_dir.iterdir()):
+                    if path.suffix in {".py", ".json"}:
+                        digest.update(f"{path.name}:{path.stat().st_mtime_ns}".encode("utf-8"))
+            except OSError:
+                pass
+    return digest.hexdigest()
+
+
+class DetectionCache:
+    """Cache wyników detekcji oparty o SQLite; bezpieczny dla wielu wątków."""
+
+    def __init__(self, path: Path | None = None) -> None:
+        self._path = Path(path) if path is not None else default_cache_path()
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self._path), check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(_SCHEMA)
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def key_for(
+        self,
+        driver: DataSourceDriver,
+        source: DiskSource,
+        volume: Volume,
+        *,
+        ruleset: str,
+        regions: Iterable[tuple[int, int]] = (),
+    ) -> str | None:
+        """Buduje klucz wpisu; `None`, gdy nagłówka lub obszarów nie da się odczytać.
+
+        `regions` to dodatkowe obszary `(offset względem wolumenu, długość)`, od
+        których zależy wynik detektorów - zmiana danych poza nagłówkiem (np. na
+        urządzeniu bez zmiany mtime) unieważnia wtedy wpis.
+        """
+
+        digest = hashlib.blake2b(digest_size=16)
+        try:
+            header_size = min(HEADER_SAMPLE_SIZE, max(int(volume.size), 0))
+            digest.update(driver.read(volume.offset, header_size))
+            for offset, size in regions:
+                digest.update(f"|{offset}:{size}|".encode("ascii"))
+                digest.update(driver.read(volume.offset + offset, size))
+        except DriverError:
+            return None
+
+        source_stamp = ""
+        if source.path is not None:
+            try:
+                stat = source.path.stat()
+                source_stamp = f"{stat.st_size}:{stat.st_mtime_ns}"
+            except OSError:
+                pass
+
+        return "|".join(
+            (
+                source.identifier,
+                source_stamp,
+                volume.identifier,
+                str(volume.offset),
+                str(volume.size),
+                digest.hexdigest(),
+                ruleset,
+            )
+        )
+
+    def get(self, key: str) -> CachedDetection | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT filesystem, status, algorithm, version, details FROM detections WHERE key = ?",
+                (key,),
+            ).fetchone()
+        if row is None:
+            return None
+        try:
+            filesystem = FileSystemType(row[0])
+            status = EncryptionStatus(row[1])
+        except ValueError:
+            return None
+        return CachedDetection(
+            filesystem=filesystem,
+            encryption=EncryptionFinding(status=status, algorithm=row[2], version=row[3], details=row[4]),
+        )
+
+    def put(self, key: str, filesystem: FileSystemType, finding: EncryptionFinding) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO detections (key, filesystem, status, algorithm, version, details) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, filesystem.value, finding.status.value, finding.algorithm, finding.version, finding.details),
+            )
+
+
+__all__ = ["CachedDetection", "DetectionCache", "default_cache_path", "ruleset_fingerprint"]
@@ -11,6 +11,8 @@ if TYPE_CHECKING:
     from crypto_analyzer.crypto_detection.detectors import EncryptionFinding
     from crypto_analyzer.metadata.scanner import MetadataResult
 
+    from .staging import StagedMetadata
+
 
 class SourceType(str, Enum):
     """Rodzaj analizowanego źródła danych."""
@@ -71,7 +73,11 @@ class Volume:
 
 @dataclass(slots=True)
 class FileMetadata:
-    """Metadane pojedynczego pliku."""
+    """Metadane pojedynczego pliku.
+
+    Dekoder pliku pośredniego (`core.staging`) tworzy rekordy pozycyjnie, więc
+    nowe pola dopisujemy wyłącznie na końcu (kolejność pilnuje test).
+    """
 
     name: str
     path: PurePosixPath
@@ -101,11 +107,18 @@ class DirectoryNode:
     subdirectories: List["DirectoryNode"] = field(default_factory=list)
 
     def iter_files(self) -> Iterable[FileMetadata]:
-        """Iteruje po wszystkich plikach w węźle (rekurencyjnie)."""
+        """Iteruje po wszystkich plikach w węźle i jego podkatalogach.
 
-        yield from self.files
-        for subdirectory in self.subdirectories:
-            yield from subdirectory.iter_files()
+        Przejście jest iteracyjne (bez limitu głębokości rekurencji), a kolejność
+        plików odpowiada przejściu w głąb: najpierw pliki węzła, potem kolejne
+        podkatalogi.
+        """
+
+        stack: List[DirectoryNode] = [self]
+        while stack:
+            node = stack.pop()
+            yield from node.files
+            stack.extend(reversed(node.subdirectories))
 
 
 @dataclass(slots=True)
@@ -116,6 +129,21 @@ class VolumeAnalysis:
     filesystem: FileSystemType
     encryption: "EncryptionFinding"
     metadata: "MetadataResult | None" = None
+    # Ustawiane zamiast `metadata`, gdy drzewo odłożono do pliku pośredniego.
+    staged_metadata: "StagedMetadata | None" = None
+
+    def load_metadata(self) -> "MetadataResult | None":
+        """Zwraca metadane wolumenu, w razie potrzeby wczytując je z pliku pośredniego.
+
+        Drzewo odłożone do pliku pośredniego jest odczytywane i dekodowane przy
+        każdym wywołaniu (wynik celowo nie jest zapamiętywany, by nie trzymać
+        w pamięci wszystkich drzew) - wywołujący powinien zachować zwrócony obiekt
+        na czas jego użycia zamiast wołać metodę wielokrotnie.
+        """
+
+        if self.metadata is not None or self.staged_metadata is None:
+            return self.metadata
+        return self.staged_metadata.load()
 
 
 @dataclass(slots=True)
@@ -128,9 +156,20 @@ class AnalysisResult:
     def total_files(self) -> int:
         """Łączna liczba plików w analizie."""
 
-        return sum(volume.metadata.total_files for volume in self.volumes if volume.metadata)
+        return self.totals()[0]
 
     def total_directories(self) -> int:
         """Łączna liczba katalogów w analizie."""
 
-        return sum(volume.metadata.total_directories for volume in self.volumes if volume.metadata)
+        return self.totals()[1]
+
+    def totals(self) -> Tuple[int, int]:
+        """Łączna liczba (plików, katalogów) policzona w jednym przejściu po wolumenach."""
+
+        files = directories = 0
+        for volume in self.volumes:
+            metadata = volume.metadata or volume.staged_metadata
+            if metadata:
+                files += metadata.total_files
+                directories += metadata.total_directories
+        return files, directories
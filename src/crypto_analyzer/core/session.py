@@ -18,5 +18,7 @@ class AnalysisSession:
     def add_volume(self, volume: Volume) -> None:
         """Dodaje wolumen do sesji, unikając duplikatów."""
 
+        # `volumes` jest publiczną listą (może być modyfikowana bezpośrednio), więc
+        # identyfikatory zbieramy przy każdym wywołaniu - sesja ma najwyżej kilka wolumenów.
         if volume.identifier not in {existing.identifier for existing in self.volumes}:
             self.volumes.append(volume)
@@ -0,0 +1,200 @@
+"""Plik pośredni z drzewami metadanych ukończonych wolumenów.
+
+Przy dużych obrazach drzewo metadanych każdego wolumenu może liczyć miliony
+węzłów. Zamiast trzymać wszystkie drzewa w pamięci do chwili eksportu, menedżer
+analizy może odkładać je (format JSON Lines, jeden wolumen na linię) do pliku
+pośredniego i zachować w wyniku jedynie lekki uchwyt z licznikami. Eksporter
+wczytuje drzewa pojedynczo, więc szczytowe zużycie pamięci odpowiada
+największemu wolumenowi, a nie sumie wszystkich.
+
+Każdy uchwyt `StagedMetadata` trzyma referencję do pliku pośredniego, więc plik
+żyje tak długo jak wyniki analizy, które go wskazują - jest zamykany i usuwany
+dopiero, gdy nic go już nie używa (albo po jawnym `close()`).
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import weakref
+from dataclasses import dataclass
+from pathlib import Path, PurePosixPath
+from typing import Any, List
+
+from crypto_analyzer.metadata import MetadataResult
+
+from .models import DirectoryNode, EncryptionStatus, FileMetadata
+
+try:  # opcjonalny, szybszy koder JSON; fallback: moduł json z biblioteki standardowej
+    import orjson
+except ImportError:  # pragma: no cover - zależne od środowiska
+    orjson = None  # type: ignore[assignment]
+
+
+@dataclass(frozen=True, slots=True)
+class StagedMetadata:
+    """Uchwyt do drzewa metadanych zapisanego w pliku pośrednim."""
+
+    staging: "MetadataStaging"
+    offset: int
+    length: int
+    total_files: int
+    total_directories: int
+
+    def load(self) -> MetadataResult:
+        """Odtwarza pełny wynik skanowania z pliku pośredniego."""
+
+        return self.staging.load(self)
+
+
+class MetadataStaging:
+    """Dopisywany plik JSON Lines z metadanymi wolumenów; bezpieczny dla wielu wątków."""
+
+    def __init__(self, path: Path) -> None:
+        self._path = Path(path)
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._handle = self._path.open("w+b")
+        self._finalizer = weakref.finalize(self, _discard, self._handle, self._path)
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    def stash(self, metadata: MetadataResult) -> StagedMetadata:
+        """Zapisuje drzewo na końcu pliku i zwraca uchwyt do niego."""
+
+        line = _dumps(_encode(metadata)) + b"\n"
+        with self._lock:
+            self._handle.seek(0, 2)
+            offset = self._handle.tell()
+            self._handle.write(line)
+        return StagedMetadata(
+            staging=self,
+            offset=offset,
+            length=len(line),
+            total_files=metadata.total_files,
+            total_directories=metadata.total_directories,
+        )
+
+    def load(self, staged: StagedMetadata) -> MetadataResult:
+        with self._lock:
+            self._handle.flush()
+            self._handle.seek(staged.offset)
+            raw = self._handle.read(staged.length)
+        return _decode(json.loads(raw))
+
+    def close(self, *, remove: bool = True) -> None:
+        """Zamyka plik pośredni (domyślnie także go usuwa)."""
+
+        with self._lock:
+            if remove:
+                self._finalizer()
+            else:
+                self._finalizer.detach()
+                self._handle.close()
+
+
+def _discard(handle: Any, path: Path) -> None:
+    handle.close()
+    path.unlink(missing_ok=True)
+
+
+def _dumps(payload: Any) -> bytes:
+    if orjson is not None:
+        try:
+            return orjson.dumps(payload)
+        except TypeError:  # np. napisy z surogatami - obsłuży je moduł json
+            pass
+    return json.dumps(payload, separators=(",", ":")).encode("ascii")
+
+
+# Drzewo zapisywane jest płasko (pre-order, indeks rodzica zamiast zagnieżdżenia),
+# dzięki czemu ani kodowanie, ani dekodowanie nie zależy od głębokości rekurencji.
+
+
+def _encode(metadata: MetadataResult) -> dict[str, Any]:
+    nodes: List[list[Any]] = []
+    stack: List[tuple[int, DirectoryNode]] = [(-1, metadata.root)]
+    while stack:
+        parent, node = stack.pop()
+        index = len(nodes)
+        nodes.append(
+            [
+                parent,
+                node.name,
+                str(node.path),
+                node.owner,
+                node.created_at,
+                node.changed_at,
+                node.modified_at,
+                node.accessed_at,
+                list(node.attributes),
+                [_encode_file(file) for file in node.files],
+            ]
+        )
+        stack.extend((index, child) for child in reversed(node.subdirectories))
+    return {
+        "total_files": metadata.total_files,
+        "total_directories": metadata.total_directories,
+        "nodes": nodes,
+    }
+
+
+def _encode_file(file: FileMetadata) -> list[Any]:
+    return [
+        file.name,
+        str(file.path),
+        file.size,
+        file.owner,
+        file.created_at,
+        file.changed_at,
+        file.modified_at,
+        file.accessed_at,
+        list(file.attributes),
+        file.encryption.value,
+    ]
+
+
+def _decode(payload: dict[str, Any]) -> MetadataResult:
+    nodes: List[DirectoryNode] = []
+    for parent, name, path, owner, created, changed, modified, accessed, attributes, files in payload["nodes"]:
+        node = DirectoryNode(
+            name=name,
+            path=PurePosixPath(path),
+            owner=owner,
+            created_at=created,
+            changed_at=changed,
+            modified_at=modified,
+            accessed_at=accessed,
+            attributes=tuple(attributes),
+            files=[_decode_file(file) for file in files],
+        )
+        if parent >= 0:
+            nodes[parent].subdirectories.append(node)
+        nodes.append(node)
+    return MetadataResult(
+        root=nodes[0],
+        total_files=payload["total_files"],
+        total_directories=payload["total_directories"],
+    )
+
+
+def _decode_file(raw: list[Any]) -> FileMetadata:
+    name, path, size, owner, created, changed, modified, accessed, attributes, encryption = raw
+    # Kolejność pól FileMetadata; wywołanie pozycyjne jest wyraźnie tańsze.
+    return FileMetadata(
+        name,
+        PurePosixPath(path),
+        size,
+        owner,
+        created,
+        changed,
+        modified,
+        accessed,
+        tuple(attributes),
+        EncryptionStatus(encryption),
+    )
+
+
+__all__ = ["MetadataStaging", "StagedMetadata"]
@@ -19,6 +19,7 @@ __all__ = [
 	"EncryptionSignature",
 	"load_signatures",
 	"load_default_signatures",
+	"load_signatures_by_id",
 ]
 
 
@@ -35,7 +36,7 @@ def __getattr__(name: str) -> Any:  # pragma: no cover
 		mod = import_module("crypto_analyzer.crypto_detection.heuristics")
 		return getattr(mod, name)
 
-	if name in {"EncryptionSignature", "load_signatures", "load_default_signatures"}:
+	if name in {"EncryptionSignature", "load_signatures", "load_default_signatures", "load_signatures_by_id"}:
 		mod = import_module("crypto_analyzer.crypto_detection.signature_loader")
 		return getattr(mod, name)
 
@@ -19,7 +19,13 @@ class EncryptionFinding:
 
 
 class EncryptionDetector(Protocol):
-    """Interfejs dla heurystyk wykrywających szyfrowanie."""
+    """Interfejs dla heurystyk wykrywających szyfrowanie.
+
+    Detektor może dodatkowo udostępniać `sample_regions(volume)` - listę obszarów
+    `(offset względem wolumenu, długość)`, od których zależy jego wynik - oraz
+    `config_fingerprint()` - odcisk swojej konfiguracji (sygnatur, progów). Oba
+    trafiają do klucza pamięci podręcznej detekcji (`core.detection_cache`).
+    """
 
     def analyze_volume(self, volume: Volume) -> EncryptionFinding:
         """Analizuje wolumen w celu określenia szyfrowania."""
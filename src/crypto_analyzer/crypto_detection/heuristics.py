@@ -14,6 +14,7 @@ wykrytego systemu plików).
 from __future__ import annotations
 
 import math
+from collections import Counter
 from dataclasses import dataclass
 
 from crypto_analyzer.core.models import EncryptionStatus, FileSystemType, Volume
@@ -21,6 +22,11 @@ from crypto_analyzer.drivers import DataSourceDriver, DriverError
 
 from .detectors import EncryptionDetector, EncryptionFinding
 
+try:  # opcjonalnie: histogram bajtów liczony w C przez NumPy
+    import numpy as np
+except ImportError:  # pragma: no cover - zależne od środowiska
+    np = None  # type: ignore[assignment]
+
 
 @dataclass(frozen=True, slots=True)
 class HeuristicConfig:
@@ -56,24 +62,23 @@ class HeuristicEncryptionDetector(EncryptionDetector):
         if len(sample) < self._config.min_sample_size:
             return EncryptionFinding(status=EncryptionStatus.UNKNOWN, details="Heurystyka: zbyt mała próbka")
 
-        entropy = _shannon_entropy(sample)
-        stats = _byte_stats(sample)
+        entropy, zero_fraction, max_byte_fraction = _histogram_stats(sample)
 
-        if stats["zero_fraction"] >= self._config.mostly_zero_threshold and entropy <= self._config.low_entropy_threshold:
+        if zero_fraction >= self._config.mostly_zero_threshold and entropy <= self._config.low_entropy_threshold:
             return EncryptionFinding(
                 status=EncryptionStatus.UNKNOWN,
                 details=(
                     "Heurystyka: próbka wygląda na puste/wyzerowane dane "
-                    f"(entropy={entropy:.2f}, zero_fraction={stats['zero_fraction']:.2f})"
+                    f"(entropy={entropy:.2f}, zero_fraction={zero_fraction:.2f})"
                 ),
             )
 
-        if stats["max_byte_fraction"] >= self._config.mostly_same_byte_threshold and entropy <= 2.0:
+        if max_byte_fraction >= self._config.mostly_same_byte_threshold and entropy <= 2.0:
             return EncryptionFinding(
                 status=EncryptionStatus.NOT_DETECTED,
                 details=(
                     "Heurystyka: dane mają niską zmienność "
-                    f"(entropy={entropy:.2f}, max_byte_fraction={stats['max_byte_fraction']:.2f})"
+                    f"(entropy={entropy:.2f}, max_byte_fraction={max_byte_fraction:.2f})"
                 ),
             )
 
@@ -83,7 +88,7 @@ class HeuristicEncryptionDetector(EncryptionDetector):
                 algorithm="Heuristic",
                 details=(
                     "Heurystyka: bardzo wysoka entropia i brak rozpoznanego FS "
-                    f"(entropy={entropy:.2f}, max_byte_fraction={stats['max_byte_fraction']:.2f})"
+                    f"(entropy={entropy:.2f}, max_byte_fraction={max_byte_fraction:.2f})"
                 ),
             )
 
@@ -92,7 +97,14 @@ class HeuristicEncryptionDetector(EncryptionDetector):
             details=f"Heurystyka: niejednoznaczne (entropy={entropy:.2f})",
         )
 
-    def _read_sample(self, volume: Volume) -> bytes:
+    def config_fingerprint(self) -> str:
+        """Odcisk progów i rozmiarów próbek (`HeuristicConfig`)."""
+
+        return repr(self._config)
+
+    def sample_regions(self, volume: Volume) -> list[tuple[int, int]]:
+        """Obszary `(offset względem wolumenu, długość)` próbkowane przez heurystykę."""
+
         size = max(int(volume.size), 0)
         sample_size = min(self._config.sample_size, size) if size > 0 else self._config.sample_size
 
@@ -101,7 +113,7 @@ class HeuristicEncryptionDetector(EncryptionDetector):
             offsets.append(max((size // 2) - (sample_size // 2), 0))
             offsets.append(max(size - sample_size, 0))
 
-        chunks: list[bytes] = []
+        regions: list[tuple[int, int]] = []
         for off in offsets:
             if size > 0:
                 max_len = max(size - off, 0)
@@ -110,17 +122,30 @@ class HeuristicEncryptionDetector(EncryptionDetector):
                     continue
             else:
                 to_read = sample_size
-            chunks.append(self._driver.read(volume.offset + off, to_read))
+            regions.append((off, to_read))
+        return regions
+
+    def _read_sample(self, volume: Volume) -> bytes:
+        return b"".join(
+            self._driver.read(volume.offset + off, size) for off, size in self.sample_regions(volume)
+        )
+
 
-        return b"".join(chunks)
+def _byte_histogram(data: bytes) -> list[int]:
+    """Liczności wszystkich 256 wartości bajtów (bez pętli po bajtach w Pythonie)."""
 
+    if np is not None:
+        return np.bincount(np.frombuffer(data, dtype=np.uint8), minlength=256).tolist()
+    counter = Counter(data)
+    return [counter.get(value, 0) for value in range(256)]
+
+
+def _histogram_stats(data: bytes) -> tuple[float, float, float]:
+    """Entropia Shannona, udział zer i udział najczęstszego bajtu z jednego histogramu."""
 
-def _shannon_entropy(data: bytes) -> float:
     if not data:
-        return 0.0
-    counts = [0] * 256
-    for b in data:
-        counts[b] += 1
+        return 0.0, 0.0, 0.0
+    counts = _byte_histogram(data)
     length = len(data)
     entropy = 0.0
     for c in counts:
@@ -128,25 +153,7 @@ def _shannon_entropy(data: bytes) -> float:
             continue
         p = c / length
         entropy -= p * math.log2(p)
-    return entropy
-
-
-def _byte_stats(data: bytes) -> dict[str, float]:
-    if not data:
-        return {"zero_fraction": 0.0, "max_byte_fraction": 0.0}
-
-    counts = [0] * 256
-    zero = 0
-    for b in data:
-        counts[b] += 1
-        if b == 0:
-            zero += 1
-
-    length = len(data)
-    return {
-        "zero_fraction": zero / length,
-        "max_byte_fraction": max(counts) / length,
-    }
+    return entropy, counts[0] / length, max(counts) / length
 
 
 __all__ = ["HeuristicConfig", "HeuristicEncryptionDetector"]
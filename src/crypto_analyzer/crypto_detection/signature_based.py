@@ -6,17 +6,116 @@ do reguł z pliku `encryption_signatures.json`.
 
 from __future__ import annotations
 
+from dataclasses import dataclass
+from functools import lru_cache
 from typing import Iterable, Sequence
 
 from crypto_analyzer.core.models import EncryptionStatus, Volume
 from crypto_analyzer.drivers import DataSourceDriver, DriverError
 
 from .detectors import EncryptionDetector, EncryptionFinding
-from .signature_loader import EncryptionSignature, load_default_signatures
+from .signature_loader import (
+    EncryptionSignature,
+    SignatureProbe,
+    default_signatures_digest,
+    load_default_signatures,
+    load_signatures_by_id,
+    signatures_fingerprint,
+)
+
+
+@dataclass(frozen=True, slots=True)
+class _DetectionPlan:
+    """Niezmienny plan detekcji dla zestawu sygnatur (wspólny dla wielu detektorów)."""
+
+    signatures: tuple[EncryptionSignature, ...]
+    probes: tuple[SignatureProbe, ...]
+    # (offset, rozmiar) scalonych obszarów odczytu.
+    spans: tuple[tuple[int, int], ...]
+    # (offset, blok, rozmiar) odczytu każdej sygnatury.
+    reads: tuple[tuple[int, int, int], ...]
+    # (offset kotwicy, krotka wzorców) każdej bramki oraz indeks bramki sygnatury.
+    gate_plan: tuple[tuple[int, tuple[bytes, ...]], ...]
+    gates: tuple[int | None, ...]
+    # Odcisk sygnatur (i pliku, z którego pochodzą) - zob. `config_fingerprint`.
+    fingerprint: str
+
+
+def _build_plan(signatures: Sequence[EncryptionSignature], *, origin: str = "") -> _DetectionPlan:
+    read_plan: dict[int, int] = {}
+    for signature in signatures:
+        offset = int(getattr(signature, "read_offset", 0) or 0)
+        size = int(signature.max_read)
+        current = read_plan.get(offset)
+        if current is None or size > current:
+            read_plan[offset] = size
+
+    probes = tuple(signature.probe for signature in signatures)
+
+    # Nakładające się lub przylegające obszary odczytu scalamy w jeden odczyt
+    # sterownika; dane poszczególnych offsetów są wycinane z wczytanego bloku.
+    spans: list[tuple[int, int]] = []
+    span_of: dict[int, int] = {}
+    for offset in sorted(read_plan):
+        end = offset + int(read_plan[offset])
+        if spans and offset <= spans[-1][0] + spans[-1][1]:
+            start, size = spans[-1]
+            spans[-1] = (start, max(size, end - start))
+        else:
+            spans.append((offset, end - offset))
+        span_of[offset] = len(spans) - 1
+
+    reads: list[tuple[int, int, int]] = []
+    for signature in signatures:
+        offset = int(getattr(signature, "read_offset", 0) or 0)
+        reads.append((offset, span_of[offset], int(read_plan[offset])))
+
+    # Sygnatury, których pierwszy wzorzec zakotwiczony leży pod tym samym offsetem
+    # (np. różne "magic" na początku nagłówka), mają wspólną bramkę: jedno
+    # `startswith(krotka_wzorców, offset)` rozstrzyga, czy którakolwiek z nich
+    # może pasować. Bramki tworzymy tylko dla grup co najmniej dwóch sygnatur.
+    groups: dict[tuple[int, int], list[int]] = {}
+    for index, (probe, (read_offset, _, _)) in enumerate(zip(probes, reads)):
+        if probe.anchored and not probe.generic:
+            groups.setdefault((read_offset, probe.anchored[0][0]), []).append(index)
+    gate_plan: list[tuple[int, tuple[bytes, ...]]] = []
+    gates: list[int | None] = [None] * len(probes)
+    for (_, anchor), members in groups.items():
+        if len(members) < 2:
+            continue
+        prefixes = tuple(dict.fromkeys(probes[index].anchored[0][1] for index in members))
+        for index in members:
+            gates[index] = len(gate_plan)
+        gate_plan.append((anchor, prefixes))
+
+    return _DetectionPlan(
+        signatures=tuple(signatures),
+        probes=probes,
+        spans=tuple(spans),
+        reads=tuple(reads),
+        gate_plan=tuple(gate_plan),
+        gates=tuple(gates),
+        fingerprint=f"{origin}:{signatures_fingerprint(signatures)}",
+    )
+
+
+@lru_cache(maxsize=None)
+def _loaded_plan(signature_ids: frozenset[str] | None) -> _DetectionPlan:
+    """Plan dla sygnatur z zasobu domyślnego - budowany raz na proces."""
+
+    origin = default_signatures_digest()
+    if signature_ids is None:
+        return _build_plan(load_default_signatures(), origin=origin)
+    return _build_plan(load_signatures_by_id(signature_ids), origin=origin)
 
 
 class SignatureBasedDetector(EncryptionDetector):
-    """Uniwersalny detektor korzystający z sygnatur z pliku konfiguracyjnego."""
+    """Uniwersalny detektor korzystający z sygnatur z pliku konfiguracyjnego.
+
+    Detektory korzystające z sygnatur domyślnych (lub ich podzbioru wg
+    identyfikatorów) współdzielą jeden plan detekcji; stan per źródło danych
+    ogranicza się do sterownika.
+    """
 
     def __init__(
         self,
@@ -25,41 +124,82 @@ class SignatureBasedDetector(EncryptionDetector):
         signatures: Sequence[EncryptionSignature] | None = None,
         signature_ids: Iterable[str] | None = None,
     ) -> None:
-        auto_signatures = list(signatures or load_default_signatures())
-        if signature_ids is not None:
-            ids = set(signature_ids)
-            auto_signatures = [signature for signature in auto_signatures if signature.identifier in ids]
-
-        if not auto_signatures:
+        if signatures:
+            auto_signatures: Sequence[EncryptionSignature] = list(signatures)
+            if signature_ids is not None:
+                ids = set(signature_ids)
+                auto_signatures = [signature for signature in auto_signatures if signature.identifier in ids]
+            plan = _build_plan(auto_signatures) if auto_signatures else None
+        else:
+            plan = _loaded_plan(frozenset(signature_ids) if signature_ids is not None else None)
+
+        if plan is None or not plan.signatures:
             raise ValueError("SignatureBasedDetector wymaga co najmniej jednej sygnatury")
 
         self._driver = driver
-        self._signatures = auto_signatures
-        self._read_plan: dict[int, int] = {}
-        for signature in self._signatures:
-            offset = int(getattr(signature, "read_offset", 0) or 0)
-            size = int(signature.max_read)
-            current = self._read_plan.get(offset)
-            if current is None or size > current:
-                self._read_plan[offset] = size
+        self._plan = plan
+        self._signatures = plan.signatures
+
+    def sample_regions(self, volume: Volume) -> list[tuple[int, int]]:
+        """Obszary `(offset względem wolumenu, długość)` czytane przez detektor."""
+
+        return list(self._plan.spans)
+
+    def config_fingerprint(self) -> str:
+        """Odcisk użytego zestawu sygnatur (wraz ze skrótem pliku sygnatur)."""
+
+        return self._plan.fingerprint
 
     def analyze_volume(self, volume: Volume) -> EncryptionFinding:
+        blocks: dict[int, bytes] = {}
         cache: dict[int, bytes] = {}
-
-        for signature in self._signatures:
-            read_offset = int(getattr(signature, "read_offset", 0) or 0)
-            if read_offset not in cache:
-                read_size = int(self._read_plan.get(read_offset, signature.max_read))
+        found: dict[tuple[int, bytes], bool] = {}
+        opened: dict[int, bool] = {}
+
+        plan = self._plan
+        for signature, probe, gate, (read_offset, span, read_size) in zip(
+            plan.signatures, plan.probes, plan.gates, plan.reads
+        ):
+            data = cache.get(read_offset)
+            if data is None:
                 try:
-                    cache[read_offset] = self._driver.read(volume.offset + read_offset, read_size)
+                    data = cache[read_offset] = self._read_region(volume, blocks, span, read_offset, read_size)
                 except DriverError:
                     return EncryptionFinding(status=EncryptionStatus.UNKNOWN)
 
-            data = cache[read_offset]
-
-            if not signature.matches(data):
+            # Obecność wzorca w obszarze odczytu sprawdzamy raz na wolumen, nawet gdy
+            # występuje w wielu sygnaturach.
+            missing = False
+            for pattern in probe.unanchored:
+                key = (read_offset, pattern)
+                hit = found.get(key)
+                if hit is None:
+                    hit = found[key] = pattern in data
+                if not hit:
+                    missing = True
+                    break
+            if missing:
                 continue
 
+            if gate is not None:
+                hit = opened.get(gate)
+                if hit is None:
+                    anchor, prefixes = plan.gate_plan[gate]
+                    hit = opened[gate] = data.startswith(prefixes, anchor)
+                if not hit:
+                    continue
+
+            if probe.generic:
+                if not signature.matches(data):
+                    continue
+            else:
+                for offset, pattern in probe.anchored:
+                    if not data.startswith(pattern, offset):
+                        missing = True
+                        break
+                if missing:
+                    continue
+
             version = signature.extract_version(data)
             return EncryptionFinding(
                 status=signature.status,
@@ -70,5 +210,27 @@ class SignatureBasedDetector(EncryptionDetector):
 
         return EncryptionFinding(status=EncryptionStatus.NOT_DETECTED)
 
+    def _read_region(
+        self,
+        volume: Volume,
+        blocks: dict[int, bytes],
+        span: int,
+        read_offset: int,
+        read_size: int,
+    ) -> bytes:
+        span_start, span_size = self._plan.spans[span]
+        if span_start == read_offset and span_size == read_size:
+            return self._driver.read(volume.offset + read_offset, read_size)
+
+        block = blocks.get(span)
+        if block is None:
+            try:
+                block = blocks[span] = self._driver.read(volume.offset + span_start, span_size)
+            except DriverError:
+                # Scalony blok może wychodzić poza koniec źródła - wtedy czytamy sam obszar.
+                return self._driver.read(volume.offset + read_offset, read_size)
+        relative = read_offset - span_start
+        return block[relative : relative + read_size]
+
 
 __all__ = ["SignatureBasedDetector"]
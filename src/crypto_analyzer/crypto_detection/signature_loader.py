@@ -2,8 +2,10 @@
 
 from __future__ import annotations
 
+import hashlib
 import json
-from dataclasses import dataclass
+import struct
+from dataclasses import dataclass, field
 from functools import lru_cache
 from importlib import resources
 from pathlib import Path
@@ -13,6 +15,13 @@ from crypto_analyzer.core.models import EncryptionStatus
 
 _DATA_PACKAGE = "crypto_analyzer.data"
 _DEFAULT_FILE = "encryption_signatures.json"
+_UINT_LE_FORMATS = {1: "<B", 2: "<H", 4: "<I", 8: "<Q"}
+_STATUS_MAP: dict[str, EncryptionStatus] = {
+    "encrypted": EncryptionStatus.ENCRYPTED,
+    "not_detected": EncryptionStatus.NOT_DETECTED,
+    "partial": EncryptionStatus.PARTIALLY_ENCRYPTED,
+    "unknown": EncryptionStatus.UNKNOWN,
+}
 
 
 @dataclass(slots=True)
@@ -24,19 +33,15 @@ class SignatureMatcher:
     offset: int | None = None
 
     def matches(self, data: bytes) -> bool:
+        # Dopasowania zakotwiczone sprawdzamy przez `startswith(wzorzec, offset)`:
+        # porównanie odbywa się w miejscu (bez kopii wycinka), a za krótkie dane
+        # po prostu nie pasują.
         if self.type == "contains":
             if self.offset is None:
                 return self.pattern in data
-            end = self.offset + len(self.pattern)
-            if end > len(data):
-                return False
-            return data[self.offset:end] == self.pattern
+            return data.startswith(self.pattern, self.offset)
         if self.type == "equals":
-            start = self.offset or 0
-            end = start + len(self.pattern)
-            if end > len(data):
-                return False
-            return data[start:end] == self.pattern
+            return data.startswith(self.pattern, self.offset or 0)
         raise ValueError(f"Nieobsługiwany typ matchera: {self.type}")
 
 
@@ -47,13 +52,25 @@ class VersionExtractor:
     type: str
     offset: int
     length: int | None = None
+    # Dla liczb o długości 1/2/4/8 bajtów wartość czytana jest wprost z bufora,
+    # bez wycinka pośredniego (`struct.unpack_from`).
+    _struct: struct.Struct | None = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self._struct = None
+        if self.type == "uint16-le":
+            fmt = _UINT_LE_FORMATS.get(self.length or 2)
+            self._struct = struct.Struct(fmt) if fmt is not None else None
 
     def extract(self, data: bytes) -> str | None:
         if self.type == "uint16-le":
             length = self.length or 2
             if self.offset + length > len(data):
                 return None
-            value = int.from_bytes(data[self.offset : self.offset + length], byteorder="little")
+            if self._struct is not None:
+                value = self._struct.unpack_from(data, self.offset)[0]
+            else:
+                value = int.from_bytes(data[self.offset : self.offset + length], byteorder="little")
             return str(value) if value else None
         if self.type == "ascii":
             length = self.length
@@ -61,12 +78,31 @@ class VersionExtractor:
                 raise ValueError("Ekstraktor ASCII wymaga podania długości")
             if self.offset + length > len(data):
                 return None
-            raw = data[self.offset : self.offset + length]
-            text = raw.decode("ascii", errors="ignore").strip("\x00")
+            # Zera z brzegów obcinamy jeszcze na bajtach; dekodowanie z `ignore`
+            # może odsłonić kolejne tylko wtedy, gdy usunęło bajty spoza ASCII.
+            raw = data[self.offset : self.offset + length].strip(b"\x00")
+            text = raw.decode("ascii", errors="ignore")
+            if len(text) != len(raw):
+                text = text.strip("\x00")
             return text or None
         raise ValueError(f"Nieobsługiwany typ ekstraktora: {self.type}")
 
 
+@dataclass(frozen=True, slots=True)
+class SignatureProbe:
+    """Plan dopasowania jednej sygnatury.
+
+    Matchery są rozdzielone na wzorce zakotwiczone `(offset, wzorzec)` i wzorce
+    wyszukiwane w całym nagłówku, więc dopasowanie nie odczytuje atrybutów
+    matcherów ani nie rozgałęzia się po ich typie. `generic` oznacza sygnaturę
+    z matcherem nieznanego typu - ta jest dopasowywana matcher po matcherze.
+    """
+
+    anchored: tuple[tuple[int, bytes], ...]
+    unanchored: tuple[bytes, ...]
+    generic: bool
+
+
 @dataclass(slots=True)
 class EncryptionSignature:
     """Konfiguracyjna definicja algorytmu szyfrowania."""
@@ -81,9 +117,24 @@ class EncryptionSignature:
     # Useful for formats with secondary headers outside the first block.
     read_offset: int = 0
     version: VersionExtractor | None = None
+    # Plan dopasowania skompilowany z `matchers` przy konstrukcji (zob. `compile_probe`);
+    # korzysta z niego zarówno `matches`, jak i `SignatureBasedDetector`.
+    probe: SignatureProbe = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self.probe = compile_probe(self.matchers)
 
     def matches(self, data: bytes) -> bool:
-        return all(matcher.matches(data) for matcher in self.matchers)
+        probe = self.probe
+        if probe.generic:
+            return all(matcher.matches(data) for matcher in self.matchers)
+        for pattern in probe.unanchored:
+            if pattern not in data:
+                return False
+        for offset, pattern in probe.anchored:
+            if not data.startswith(pattern, offset):
+                return False
+        return True
 
     def extract_version(self, data: bytes) -> str | None:
         if self.version is None:
@@ -91,6 +142,24 @@ class EncryptionSignature:
         return self.version.extract(data)
 
 
+def compile_probe(matchers: Sequence[SignatureMatcher]) -> SignatureProbe:
+    """Rozdziela matchery sygnatury na wzorce zakotwiczone i wyszukiwane w całości."""
+
+    anchored: list[tuple[int, bytes]] = []
+    unanchored: dict[bytes, None] = {}
+    generic = False
+    for matcher in matchers:
+        if matcher.type == "contains" and matcher.offset is None:
+            # Pusty wzorzec pasuje zawsze; powtórzony wystarczy sprawdzić raz.
+            if matcher.pattern:
+                unanchored[matcher.pattern] = None
+        elif matcher.type in ("contains", "equals"):
+            anchored.append((matcher.offset or 0, matcher.pattern))
+        else:
+            generic = True
+    return SignatureProbe(anchored=tuple(anchored), unanchored=tuple(unanchored), generic=generic)
+
+
 def _pattern_to_bytes(pattern: str, encoding: str | None) -> bytes:
     if encoding is None or encoding.lower() == "ascii":
         return pattern.encode("ascii")
@@ -102,16 +171,10 @@ def _pattern_to_bytes(pattern: str, encoding: str | None) -> bytes:
 
 
 def _status_from_string(value: str) -> EncryptionStatus:
-    mapping = {
-        "encrypted": EncryptionStatus.ENCRYPTED,
-        "not_detected": EncryptionStatus.NOT_DETECTED,
-        "partial": EncryptionStatus.PARTIALLY_ENCRYPTED,
-        "unknown": EncryptionStatus.UNKNOWN,
-    }
-    try:
-        return mapping[value.lower()]
-    except KeyError as exc:
-        raise ValueError(f"Nieznany status szyfrowania: {value}") from exc
+    status = _STATUS_MAP.get(value.lower())
+    if status is None:
+        raise ValueError(f"Nieznany status szyfrowania: {value}")
+    return status
 
 
 def _load_raw_config(path: Path | None = None) -> Iterable[dict]:
@@ -167,7 +230,39 @@ def load_signatures(path: Path | None = None) -> List[EncryptionSignature]:
 
 
 @lru_cache(maxsize=1)
-def load_default_signatures() -> List[EncryptionSignature]:
-    """Wczytuje i cache'uje sygnatury z zasobu pakietu."""
+def _load_default() -> tuple[tuple[EncryptionSignature, ...], str]:
+    data = resources.files(_DATA_PACKAGE).joinpath(_DEFAULT_FILE).read_bytes()
+    signatures = tuple(_parse_signature(entry) for entry in json.loads(data))
+    return signatures, hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def load_default_signatures() -> tuple[EncryptionSignature, ...]:
+    """Wczytuje i cache'uje sygnatury z zasobu pakietu.
+
+    Wynik jest krotką współdzieloną przez wszystkich wywołujących, więc nie
+    można go przypadkiem zmodyfikować.
+    """
+
+    return _load_default()[0]
+
+
+def default_signatures_digest() -> str:
+    """Skrót pliku sygnatur, z którego pochodzi `load_default_signatures()`."""
+
+    return _load_default()[1]
+
+
+def signatures_fingerprint(signatures: Iterable[EncryptionSignature]) -> str:
+    """Odcisk definicji sygnatur: identyfikatorów, wzorców, offsetów i ekstraktorów wersji."""
+
+    digest = hashlib.blake2b(digest_size=16)
+    for signature in signatures:
+        digest.update(repr(signature).encode("utf-8"))
+    return digest.hexdigest()
+
+
+@lru_cache(maxsize=None)
+def load_signatures_by_id(ids: frozenset[str]) -> tuple[EncryptionSignature, ...]:
+    """Domyślne sygnatury o wskazanych identyfikatorach (w kolejności z konfiguracji)."""
 
-    return load_signatures()
+    return tuple(signature for signature in load_default_signatures() if signature.identifier in ids)
@@ -6,6 +6,8 @@ import json
 import os
 import platform
 import subprocess
+import threading
+from collections import OrderedDict
 from functools import lru_cache
 from pathlib import Path
 from typing import Iterable, Iterator, List
@@ -16,6 +18,12 @@ from structlog import get_logger
 from crypto_analyzer.core.models import DiskSource, FileSystemType, SourceType, Volume
 from .base import DriverCapabilities, DriverError
 
+# Ostatnio odczytane obszary źródła (do `_READ_CACHE_MAX_BYTES` każdy). Klucz cache
+# detekcji, detektor sygnatur i heurystyka czytają ten sam nagłówek wolumenu -
+# kolejne odczyty zawarte w zapamiętanym obszarze są obsługiwane wycinkiem.
+_READ_CACHE_ENTRIES = 16
+_READ_CACHE_MAX_BYTES = 1 << 20
+
 
 class _BaseTskDriver:
     """Wspólna logika obsługi pytsk3 dla różnych typów źródeł."""
@@ -29,6 +37,15 @@ class _BaseTskDriver:
         self._current_source: DiskSource | None = None
         self._image_size: int = 0
         self._synthetic_volumes: list[Volume] = []
+        # (identyfikator, offset, rozmiar) partycji - tablica TSK przechodzona raz na źródło.
+        self._partitions: list[tuple[str, int, int]] | None = None
+        self._read_cache: OrderedDict[int, bytes] = OrderedDict()
+        self._read_lock = threading.Lock()
+        # Ostatnio otwarty FS_Info jako (offset wolumenu, wątek, uchwyt). Detektor FS
+        # i skaner metadanych otwierają ten sam wolumen kolejno w jednym wątku -
+        # drugie otwarcie przejmuje uchwyt (jednorazowo). Trzymamy jeden uchwyt,
+        # a klucz z identyfikatorem wątku nie pozwala przekazać go innemu wątkowi.
+        self._last_fs: tuple[int, int, pytsk3.FS_Info] | None = None
 
     # ------------------------------------------------------------------
     # Wspólne operacje
@@ -45,6 +62,8 @@ class _BaseTskDriver:
         self._image_size = int(self._img.get_size())
         self._current_source = source
         self._synthetic_volumes = []
+        self._partitions = None
+        self._reset_caches()
 
         try:
             self._volume_info = pytsk3.Volume_Info(self._img)
@@ -72,6 +91,13 @@ class _BaseTskDriver:
         self._current_source = None
         self._image_size = 0
         self._synthetic_volumes = []
+        self._partitions = None
+        self._reset_caches()
+
+    def _reset_caches(self) -> None:
+        with self._read_lock:
+            self._read_cache.clear()
+            self._last_fs = None
 
     def list_volumes(self) -> Iterator[Volume]:
         if self._current_source is None:
@@ -81,24 +107,10 @@ class _BaseTskDriver:
             yield from self._synthetic_volumes
             return
 
-        block_size = self._volume_info.info.block_size
-        for index, partition in enumerate(self._volume_info, start=1):
-            if partition.len <= 0:
-                continue
-
-            # Skip unallocated / metadata "partitions" returned by TSK.
-            # This keeps the UI/CLI and benchmarks focused on real allocated volumes.
-            alloc_flag = getattr(pytsk3, "TSK_VS_PART_FLAG_ALLOC", None)
-            part_flags = getattr(partition, "flags", None)
-            if alloc_flag is not None and isinstance(part_flags, int) and (part_flags & alloc_flag) == 0:
-                continue
-
-            yield Volume(
-                identifier=f"{self._current_source.identifier}:{index}",
-                offset=partition.start * block_size,
-                size=partition.len * block_size,
-                filesystem=FileSystemType.UNKNOWN,
-            )
+        if self._partitions is None:
+            self._partitions = list(_read_partitions(self._volume_info, self._current_source.identifier))
+        for identifier, offset, size in self._partitions:
+            yield Volume(identifier=identifier, offset=offset, size=size, filesystem=FileSystemType.UNKNOWN)
 
     def open_filesystem(self, volume: Volume) -> pytsk3.FS_Info:
         if self._img is None:
@@ -106,18 +118,42 @@ class _BaseTskDriver:
         if self._volume_info is None and volume not in self._synthetic_volumes:
             raise DriverError("Brak informacji o systemie plików dla tego źródła")
 
+        thread_id = threading.get_ident()
+        with self._read_lock:
+            last = self._last_fs
+            if last is not None and last[0] == volume.offset and last[1] == thread_id:
+                self._last_fs = None
+                return last[2]
         try:
-            return pytsk3.FS_Info(self._img, offset=volume.offset)
+            handle = pytsk3.FS_Info(self._img, offset=volume.offset)
         except (IOError, RuntimeError) as exc:  # pragma: no cover - zależne od środowiska
             raise DriverError(f"Nie udało się otworzyć systemu plików wolumenu {volume.identifier}") from exc
+        with self._read_lock:
+            self._last_fs = (volume.offset, thread_id, handle)
+        return handle
 
     def read(self, offset: int, size: int) -> bytes:
         if self._img is None:
             raise DriverError("Brak otwartego źródła")
+        end = offset + size
+        with self._read_lock:
+            for start, block in reversed(self._read_cache.items()):
+                if start <= offset and end <= start + len(block):
+                    self._read_cache.move_to_end(start)
+                    if start == offset and size == len(block):
+                        return block
+                    return block[offset - start : end - start]
         try:
-            return self._img.read(offset, size)
+            data = self._img.read(offset, size)
         except (IOError, RuntimeError) as exc:  # pragma: no cover - zależne od środowiska
             raise DriverError("Nie udało się odczytać danych") from exc
+        if len(data) <= _READ_CACHE_MAX_BYTES:
+            with self._read_lock:
+                self._read_cache[offset] = data
+                self._read_cache.move_to_end(offset)
+                if len(self._read_cache) > _READ_CACHE_ENTRIES:
+                    self._read_cache.popitem(last=False)
+        return data
 
 
 class TskImageDriver(_BaseTskDriver):
@@ -202,6 +238,26 @@ class TskPhysicalDiskDriver(_BaseTskDriver):
         self._open_with_tsk(source, source.path, context="dysku fizycznego")
 
 
+def _read_partitions(volume_info: pytsk3.Volume_Info, source_identifier: str) -> Iterator[tuple[str, int, int]]:
+    block_size = volume_info.info.block_size
+    # Skip unallocated / metadata "partitions" returned by TSK.
+    # This keeps the UI/CLI and benchmarks focused on real allocated volumes.
+    alloc_flag = getattr(pytsk3, "TSK_VS_PART_FLAG_ALLOC", None)
+    for index, partition in enumerate(volume_info, start=1):
+        if partition.len <= 0:
+            continue
+
+        part_flags = getattr(partition, "flags", None)
+        if alloc_flag is not None and isinstance(part_flags, int) and (part_flags & alloc_flag) == 0:
+            continue
+
+        yield (
+            f"{source_identifier}:{index}",
+            partition.start * block_size,
+            partition.len * block_size,
+        )
+
+
 def _discover_physical_disks(*, max_devices: int = 32) -> List[DiskSource]:
     system = platform.system().lower()
     if system == "windows":
@@ -5,6 +5,7 @@ from __future__ import annotations
 from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from dataclasses import dataclass
 from datetime import datetime, timezone
+from functools import lru_cache
 import os
 from pathlib import PurePosixPath
 import stat
@@ -362,7 +363,10 @@ class TskMetadataScanner(MetadataScanner):
         return datetime.fromtimestamp(value, tz=timezone.utc).isoformat()
 
     @staticmethod
+    @lru_cache(maxsize=4096)
     def _format_owner(uid: int | None, gid: int | None) -> str | None:
+        # Pamięć podręczna: jedno wyszukanie pwd/grp na parę (uid, gid), a wszystkie
+        # pliki tego samego właściciela współdzielą jeden obiekt str.
         if uid is None and gid is None:
             return None
 
@@ -396,12 +400,17 @@ class TskMetadataScanner(MetadataScanner):
         return ",".join(part for part in (uid_part, gid_part) if part)
 
     def _extract_attributes(self, meta: pytsk3.TSK_FS_META) -> Tuple[str, ...]:
+        return self._attributes_for(getattr(meta, "mode", None), getattr(meta, "flags", 0))
+
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _attributes_for(mode: int | None, flags: int) -> Tuple[str, ...]:
+        # Kombinacji (mode, flags) jest niewiele - pliki współdzielą jedną krotkę atrybutów.
         attributes: List[str] = []
-        mode_repr = self._format_mode(getattr(meta, "mode", None))
+        mode_repr = TskMetadataScanner._format_mode(mode)
         if mode_repr:
             attributes.append(f"mode:{mode_repr}")
 
-        flags = getattr(meta, "flags", 0)
         for flag, label in _FLAG_NAMES:
             if flag and flags & flag:
                 attributes.append(label)
@@ -13,6 +13,13 @@ from crypto_analyzer.metadata import MetadataResult
 from .exporter import ExportFormat, ReportExporter
 
 
+def _indented_json(value: object, *, level: int = 1) -> str:
+    """`json.dumps(..., indent=2)` dla wartości zagnieżdżonej na danym poziomie wcięcia."""
+
+    text = json.dumps(value, indent=2, ensure_ascii=False)
+    return text.replace("\n", "\n" + "  " * level)
+
+
 class DefaultReportExporter(ReportExporter):
     """Eksporter zapisujący wyniki analizy do plików CSV lub JSON."""
 
@@ -20,8 +27,7 @@ class DefaultReportExporter(ReportExporter):
         destination.parent.mkdir(parents=True, exist_ok=True)
 
         if fmt is ExportFormat.JSON:
-            payload = self._build_json_payload(result)
-            destination.write_text(json.dumps(payload, indent=2, ensure_ascii=False), encoding="utf-8")
+            self._write_json(result, destination)
         elif fmt is ExportFormat.CSV:
             self._write_csv(result, destination)
         else:  # pragma: no cover - obsługa przyszłych formatów
@@ -33,7 +39,26 @@ class DefaultReportExporter(ReportExporter):
     # JSON
     # ------------------------------------------------------------------
 
-    def _build_json_payload(self, result: AnalysisResult) -> Dict[str, object]:
+    def _write_json(self, result: AnalysisResult, destination: Path) -> None:
+        """Zapisuje raport wolumen po wolumenie (pola nagłówka, potem tablica `volumes`).
+
+        Wynik jest identyczny z `json.dumps(payload, indent=2)`, ale w pamięci
+        znajduje się naraz słownik tylko jednego wolumenu (drzewa odłożone do
+        pliku pośredniego są wczytywane pojedynczo).
+        """
+
+        with destination.open("w", encoding="utf-8") as handle:
+            handle.write("{")
+            for key, value in self._json_header(result).items():
+                handle.write(f"\n  {json.dumps(key, ensure_ascii=False)}: {_indented_json(value)},")
+            handle.write('\n  "volumes": [')
+            for index, volume in enumerate(result.volumes):
+                handle.write(",\n    " if index else "\n    ")
+                handle.write(_indented_json(self._volume_to_dict(volume), level=2))
+            handle.write("\n  ]\n}" if result.volumes else "]\n}")
+
+    def _json_header(self, result: AnalysisResult) -> Dict[str, object]:
+        total_files, total_directories = result.totals()
         return {
             "source": {
                 "identifier": result.source.identifier,
@@ -43,20 +68,20 @@ class DefaultReportExporter(ReportExporter):
             },
             "totals": {
                 "volumes": len(result.volumes),
-                "files": result.total_files(),
-                "directories": result.total_directories(),
+                "files": total_files,
+                "directories": total_directories,
             },
-            "volumes": [self._volume_to_dict(volume) for volume in result.volumes],
         }
 
     def _volume_to_dict(self, analysis: VolumeAnalysis) -> Dict[str, object]:
+        metadata = analysis.load_metadata()
         return {
             "identifier": analysis.volume.identifier,
             "filesystem": analysis.filesystem.value,
             "offset": analysis.volume.offset,
             "size": analysis.volume.size,
             "encryption": self._encryption_to_dict(analysis.encryption),
-            "metadata": self._metadata_to_dict(analysis.metadata) if analysis.metadata else None,
+            "metadata": self._metadata_to_dict(metadata) if metadata else None,
         }
 
     def _metadata_to_dict(self, metadata: MetadataResult) -> Dict[str, object]:
@@ -140,7 +165,8 @@ class DefaultReportExporter(ReportExporter):
                 "encryption_algorithm": encryption.algorithm,
                 "encryption_version": encryption.version,
             }
-            if analysis.metadata is None:
+            metadata = analysis.load_metadata()
+            if metadata is None:
                 yield {
                     **base_row,
                     "entry_type": "volume",
@@ -156,7 +182,7 @@ class DefaultReportExporter(ReportExporter):
                 }
                 continue
 
-            yield from self._iter_directory_rows(analysis.metadata.root, base_row)
+            yield from self._iter_directory_rows(metadata.root, base_row)
 
     def _iter_directory_rows(
         self,
@@ -810,7 +810,8 @@ class MainWindow(QMainWindow):
             )
             self._results_tree.addTopLevelItem(volume_item)
 
-            if analysis.metadata is None:
+            metadata = analysis.load_metadata()
+            if metadata is None:
                 note_item = QTreeWidgetItem([
                     self._text("tree.metadata_skipped"),
                     self._text("tree.info"),
@@ -822,7 +823,7 @@ class MainWindow(QMainWindow):
                 volume_item.addChild(note_item)
                 continue
 
-            root_node = analysis.metadata.root
+            root_node = metadata.root
             root_item = QTreeWidgetItem([
                 root_node.name,
                 self._text("tree.directory"),
@@ -924,15 +925,17 @@ class MainWindow(QMainWindow):
             if not collect_metadata:
                 continue
 
-            if volume_result.metadata is not None:
+            # Sama obecność drzewa - bez wczytywania go z pliku pośredniego.
+            if volume_result.metadata is not None or volume_result.staged_metadata is not None:
                 lines.append(self._text("summary.metadata.volume.collected"))
                 continue
 
             lines.append(self._text("summary.metadata.volume.skipped"))
 
         lines.append(self._text("summary.totals.volumes").format(count=len(result.volumes)))
-        lines.append(self._text("summary.totals.files").format(count=result.total_files()))
-        lines.append(self._text("summary.totals.directories").format(count=result.total_directories()))
+        total_files, total_directories = result.totals()
+        lines.append(self._text("summary.totals.files").format(count=total_files))
+        lines.append(self._text("summary.totals.directories").format(count=total_directories))
         lines.append(
             self._text("summary.metadata.enabled" if collect_metadata else "summary.metadata.disabled")
         )
@@ -60,3 +60,28 @@ def test_load_ai_config_respects_openai_vars(monkeypatch):
     assert cfg.api_key == "k"
     assert cfg.endpoint == "https://api.example.test/v1"
     assert cfg.model == "gpt-x"
+
+
+def test_dotenv_is_parsed_once(monkeypatch, tmp_path):
+    import crypto_analyzer.ai.config as ai_config
+
+    (tmp_path / ".env").write_text(
+        '# comment\nCRYPTOAI_API_KEY = "from-dotenv"\nCRYPTOAI_ENDPOINT=\'https://dotenv.test\'\nUNRELATED=1\n',
+        encoding="utf-8",
+    )
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv("CRYPTOANALYZER_DISABLE_DOTENV", raising=False)
+    # Empty values count as unset and are restored by monkeypatch afterwards.
+    monkeypatch.setenv("CRYPTOAI_API_KEY", "")
+    monkeypatch.setenv("CRYPTOAI_ENDPOINT", "")
+    monkeypatch.delenv("UNRELATED", raising=False)
+    monkeypatch.setattr(ai_config, "_DOTENV_LOADED", False)
+
+    ai_config._load_dotenv_if_present()
+    assert os.environ["CRYPTOAI_API_KEY"] == "from-dotenv"
+    assert os.environ["CRYPTOAI_ENDPOINT"] == "https://dotenv.test"
+    assert "UNRELATED" not in os.environ
+
+    monkeypatch.setenv("CRYPTOAI_API_KEY", "")
+    ai_config._load_dotenv_if_present()
+    assert os.environ["CRYPTOAI_API_KEY"] == ""
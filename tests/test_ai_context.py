@@ -2,8 +2,59 @@ from __future__ import annotations
 
 from pathlib import PurePosixPath
 
-from crypto_analyzer.ai.context import _sort_key_mtime
-from crypto_analyzer.core.models import FileMetadata
+from crypto_analyzer.ai.context import (
+    _sort_key_mtime,
+    build_ai_context,
+    find_suspicious,
+)
+from crypto_analyzer.core.models import (
+    AnalysisResult,
+    DirectoryNode,
+    DiskSource,
+    EncryptionStatus,
+    FileMetadata,
+    FileSystemType,
+    SourceType,
+    Volume,
+    VolumeAnalysis,
+)
+from crypto_analyzer.crypto_detection.detectors import EncryptionFinding
+from crypto_analyzer.metadata.scanner import MetadataResult
+
+
+def _file(path: str, *, size: int = 0, modified_at: str | None = None) -> FileMetadata:
+    p = PurePosixPath(path)
+    return FileMetadata(
+        name=p.name,
+        path=p,
+        size=size,
+        owner=None,
+        created_at=None,
+        changed_at=None,
+        modified_at=modified_at,
+        accessed_at=None,
+    )
+
+
+def test_iter_files_walks_depth_first_in_tree_order() -> None:
+    root = DirectoryNode(
+        name="/",
+        path=PurePosixPath("/"),
+        files=[_file("/r1")],
+        subdirectories=[
+            DirectoryNode(
+                name="a",
+                path=PurePosixPath("/a"),
+                files=[_file("/a/1")],
+                subdirectories=[
+                    DirectoryNode(name="x", path=PurePosixPath("/a/x"), files=[_file("/a/x/1")])
+                ],
+            ),
+            DirectoryNode(name="b", path=PurePosixPath("/b"), files=[_file("/b/1")]),
+        ],
+    )
+
+    assert [str(f.path) for f in root.iter_files()] == ["/r1", "/a/1", "/a/x/1", "/b/1"]
 
 
 def test_sort_key_mtime_handles_naive_and_aware_datetimes() -> None:
@@ -51,3 +102,90 @@ def test_sort_key_mtime_handles_naive_and_aware_datetimes() -> None:
     # Sorting should not raise and should place the missing timestamp first.
     ordered = sorted([f_naive, f_none, f_aware], key=_sort_key_mtime)
     assert ordered[0] is f_none
+
+
+def _result_with_files(files: list[FileMetadata]) -> AnalysisResult:
+    root = DirectoryNode(name="/", path=PurePosixPath("/"), files=files)
+    volume = Volume(identifier="vol1", offset=0, size=1024, filesystem=FileSystemType.FAT16)
+    return AnalysisResult(
+        source=DiskSource(identifier="img", source_type=SourceType.DISK_IMAGE, display_name="img"),
+        volumes=[
+            VolumeAnalysis(
+                volume=volume,
+                filesystem=FileSystemType.FAT16,
+                encryption=EncryptionFinding(status=EncryptionStatus.NOT_DETECTED),
+                metadata=MetadataResult(root=root, total_files=len(files), total_directories=1),
+            )
+        ],
+    )
+
+
+def test_build_ai_context_samples_largest_and_most_recent_files() -> None:
+    files = [
+        _file("/small-old", size=1, modified_at="2020-01-01T00:00:00"),
+        _file("/big", size=100, modified_at="2021-01-01T00:00:00"),
+        _file("/new", size=2, modified_at="2025-01-01T00:00:00"),
+        _file("/medium", size=50, modified_at=None),
+    ]
+
+    context = build_ai_context(_result_with_files(files), max_files_per_volume=4)
+
+    sample = [entry["path"] for entry in context["volumes"][0]["files_sample"]]
+    assert sample == ["/big", "/medium", "/new"]
+
+
+def test_find_suspicious_reports_extension_first_then_keyword() -> None:
+    files = [
+        _file("/home/user/Wallet.DAT"),
+        _file("/home/user/notes/passwords.txt"),
+        _file("/etc/keystore/readme"),
+        _file("/home/user/photo.jpg"),
+    ]
+
+    hits = find_suspicious(files)
+
+    assert [(h.path, h.reason) for h in hits] == [
+        ("/home/user/Wallet.DAT", "extension:.dat"),
+        ("/home/user/notes/passwords.txt", "keyword:password"),
+        ("/etc/keystore/readme", "keyword:key"),
+    ]
+
+
+def test_find_suspicious_reports_leftmost_keyword() -> None:
+    hits = find_suspicious([_file("/home/user/.ssh/id_rsa_password_backup")])
+
+    assert [(h.path, h.reason) for h in hits] == [
+        ("/home/user/.ssh/id_rsa_password_backup", "keyword:id_rsa"),
+    ]
+
+
+def test_find_suspicious_counts_each_path_once_towards_limit() -> None:
+    files = [
+        _file("/secret.key"),
+        _file("/secret.key"),
+        _file("/token.txt"),
+        _file("/wallet.dat"),
+    ]
+
+    hits = find_suspicious(files, max_results=2)
+
+    assert [(h.path, h.reason) for h in hits] == [
+        ("/secret.key", "extension:.key"),
+        ("/token.txt", "keyword:token"),
+    ]
+
+
+def test_directory_iter_files_handles_trees_deeper_than_recursion_limit() -> None:
+    import sys
+
+    depth = sys.getrecursionlimit() + 100
+    root = DirectoryNode(name="/", path=PurePosixPath("/"))
+    node = root
+    for level in range(depth):
+        child = DirectoryNode(name=str(level), path=PurePosixPath(f"/{level}"), files=[_file(f"/{level}/f")])
+        node.subdirectories.append(child)
+        node = child
+
+    paths = [str(f.path) for f in root.iter_files()]
+    assert len(paths) == depth
+    assert paths[0] == "/0/f" and paths[-1] == f"/{depth - 1}/f"
@@ -12,9 +12,10 @@ def test_generate_summary_and_suspicious_parses_json(monkeypatch):
     monkeypatch.setattr("crypto_analyzer.ai.insights.build_ai_context", lambda *_args, **_kwargs: {"ok": True})
 
     class _Client:
-        def chat(self, *, system, user, temperature):
+        def chat(self, *, system, user, temperature, json_mode=False):
             assert "CONTEXT_JSON" in user
             assert "Reply in Polish" in system
+            assert json_mode is True
             return json.dumps({"summary": "S", "suspicious": "X", "next_steps": "N"})
 
     service._client = _Client()  # type: ignore[assignment]
@@ -54,7 +55,7 @@ def test_generate_summary_and_suspicious_normalizes_list_outputs(monkeypatch):
     monkeypatch.setattr("crypto_analyzer.ai.insights.build_ai_context", lambda *_args, **_kwargs: {"ok": True})
 
     class _Client:
-        def chat(self, *, system, user, temperature):
+        def chat(self, *, system, user, temperature, json_mode=False):
             return json.dumps(
                 {
                     "summary": ["A", "B"],
@@ -104,3 +105,40 @@ def test_answer_question_rejects_empty_question(monkeypatch):
 
     with pytest.raises(ValueError):
         service.answer_question(object(), "   ")
+
+
+def test_context_is_built_once_per_result_and_locale(monkeypatch):
+    from crypto_analyzer.ai.config import AiConfig
+    from crypto_analyzer.ai.insights import AiInsightsService
+
+    service = AiInsightsService(AiConfig(api_key="k", endpoint="https://api.example.test", model="4o-mini"))
+
+    calls = []
+
+    def fake_build(result, **kwargs):
+        calls.append((result, kwargs.get("ui_locale")))
+        return {"a": [1, 2]}
+
+    monkeypatch.setattr("crypto_analyzer.ai.insights.build_ai_context", fake_build)
+
+    users = []
+
+    class _Client:
+        def chat(self, *, system, user, temperature, json_mode=False):
+            users.append(user)
+            return "answer"
+
+    service._client = _Client()  # type: ignore[assignment]
+
+    result = object()
+    service.answer_question(result, "Q1?", ui_locale="en")
+    service.answer_question(result, "Q2?", ui_locale="en")
+    assert len(calls) == 1
+    assert users[0].endswith('CONTEXT_JSON:\n{"a":[1,2]}')
+
+    service.answer_question(result, "Q3?", ui_locale="pl")
+    service.generate_summary_and_suspicious(result, ui_locale="en")
+    assert len(calls) == 2
+
+    service.answer_question(object(), "Q4?", ui_locale="pl")
+    assert len(calls) == 3
@@ -210,3 +210,106 @@ def test_analysis_manager_handles_encrypted_unknown_filesystem() -> None:
     assert session.volumes[0].encryption is EncryptionStatus.ENCRYPTED
 
     manager.close()
+
+
+def test_detection_cache_skips_detectors_on_repeat_analysis(tmp_path) -> None:
+    from crypto_analyzer.core.detection_cache import DetectionCache
+
+    header = b"-FVE-FS-" + b"\x00" * 4088
+    cache = DetectionCache(tmp_path / "detect.db")
+    encryption_detector_calls: list[str] = []
+
+    class CountingDetector:
+        def analyze_volume(self, volume: Volume) -> EncryptionFinding:
+            encryption_detector_calls.append(volume.identifier)
+            return EncryptionFinding(status=EncryptionStatus.ENCRYPTED, algorithm="BitLocker", version="2")
+
+    def run(data: bytes, fs_detector: StubFileSystemDetector) -> EncryptionFinding:
+        driver = StubDriver(data)
+        manager = AnalysisManager(
+            driver=driver,
+            filesystem_detector=fs_detector,
+            encryption_detectors=[CountingDetector()],
+            metadata_scanner=StubMetadataScanner(),
+            report_exporter=DummyExporter(),
+            detection_cache=cache,
+        )
+        session = manager.start_session(driver.enumerate_sources()[0])
+        result = manager.analyze([session.volumes[0].identifier])
+        manager.close()
+        assert session.volumes[0].filesystem is FileSystemType.NTFS
+        assert session.volumes[0].encryption is EncryptionStatus.ENCRYPTED
+        return result.volumes[0].encryption
+
+    fs_detector = StubFileSystemDetector(FileSystemType.NTFS)
+    first = run(header, fs_detector)
+    second = run(header, fs_detector)
+    assert second == first
+    assert fs_detector.calls == ["stub-image:1"]
+    assert encryption_detector_calls == ["stub-image:1"]
+
+    # A different header is a cache miss.
+    run(b"\x01" + header[1:], fs_detector)
+    assert len(encryption_detector_calls) == 2
+    cache.close()
+
+
+def test_ruleset_fingerprint_covers_detector_configuration() -> None:
+    from crypto_analyzer.core.detection_cache import ruleset_fingerprint
+    from crypto_analyzer.crypto_detection.heuristics import (
+        HeuristicConfig,
+        HeuristicEncryptionDetector,
+    )
+    from crypto_analyzer.crypto_detection.signature_based import SignatureBasedDetector
+
+    driver = StubDriver(b"")
+    full = ruleset_fingerprint([SignatureBasedDetector(driver)])
+    subset = ruleset_fingerprint([SignatureBasedDetector(driver, signature_ids=("veracrypt",))])
+    assert full != subset
+    assert full == ruleset_fingerprint([SignatureBasedDetector(StubDriver(b""))])
+
+    default = ruleset_fingerprint([HeuristicEncryptionDetector(driver)])
+    tuned = ruleset_fingerprint(
+        [HeuristicEncryptionDetector(driver, config=HeuristicConfig(high_entropy_threshold=7.5))]
+    )
+    assert default != tuned
+
+
+def test_detection_cache_key_covers_detector_sample_regions(tmp_path) -> None:
+    from crypto_analyzer.core.detection_cache import HEADER_SAMPLE_SIZE, DetectionCache
+
+    size = HEADER_SAMPLE_SIZE * 4
+    cache = DetectionCache(tmp_path / "detect.db")
+    calls: list[str] = []
+
+    class TailSamplingDetector:
+        def sample_regions(self, volume: Volume) -> list[tuple[int, int]]:
+            return [(volume.size - 512, 512)]
+
+        def analyze_volume(self, volume: Volume) -> EncryptionFinding:
+            calls.append(volume.identifier)
+            return EncryptionFinding(status=EncryptionStatus.NOT_DETECTED)
+
+    def run(data: bytes) -> None:
+        driver = StubDriver(data)
+        manager = AnalysisManager(
+            driver=driver,
+            filesystem_detector=StubFileSystemDetector(FileSystemType.NTFS),
+            encryption_detectors=[TailSamplingDetector()],
+            metadata_scanner=StubMetadataScanner(),
+            report_exporter=DummyExporter(),
+            detection_cache=cache,
+        )
+        session = manager.start_session(driver.enumerate_sources()[0])
+        manager.analyze([session.volumes[0].identifier])
+        manager.close()
+
+    data = b"\x00" * size
+    run(data)
+    run(data)
+    assert len(calls) == 1
+
+    # Same header, different tail: the sampled region is part of the key.
+    run(data[:-1] + b"\x01")
+    assert len(calls) == 2
+    cache.close()
@@ -128,3 +128,243 @@ def test_format_metadata_detail() -> None:
     assert AnalysisManager._format_metadata_detail("file", "/a/b") == "Plik: /a/b"
     assert AnalysisManager._format_metadata_detail("other", "/x") == "/x"
     assert AnalysisManager._format_metadata_detail("file", None) is None
+
+
+def test_parallel_analysis_keeps_volume_order() -> None:
+    import time
+
+    volumes = [
+        Volume(identifier=f"v{i}", offset=i * 512, size=512, filesystem=FileSystemType.UNKNOWN) for i in range(5)
+    ]
+    driver = _StubDriver(volumes)
+    seen_threads: set[int] = set()
+
+    class _SlowDet:
+        def analyze_volume(self, volume: Volume) -> EncryptionFinding:
+            seen_threads.add(threading.get_ident())
+            # Earlier volumes finish later, so completion order differs from input order.
+            time.sleep(0.01 * (5 - volume.offset // 512))
+            return EncryptionFinding(status=EncryptionStatus.NOT_DETECTED, details=volume.identifier)
+
+    manager = AnalysisManager(
+        driver=driver,
+        filesystem_detector=_FsDet(FileSystemType.NTFS),
+        encryption_detectors=[_SlowDet()],
+        metadata_scanner=_NoopMetadataScanner(),
+        report_exporter=_DummyExporter(),
+        max_workers=3,
+    )
+
+    source = DiskSource(identifier="img", source_type=SourceType.DISK_IMAGE, display_name="img", path=Path("/tmp/a"))
+    manager.start_session(source)
+
+    result = manager.analyze(["v4", "v0", "v2", "v1", "v3"], collect_metadata=False)
+
+    assert [item.volume.identifier for item in result.volumes] == ["v0", "v1", "v2", "v3", "v4"]
+    assert [item.encryption.details for item in result.volumes] == ["v0", "v1", "v2", "v3", "v4"]
+    assert len(seen_threads) > 1
+
+
+def test_parallel_progress_is_reported_on_calling_thread_in_order() -> None:
+    import time
+
+    volumes = [
+        Volume(identifier=f"v{i}", offset=i * 512, size=512, filesystem=FileSystemType.UNKNOWN) for i in range(4)
+    ]
+    reported: list[tuple[int, int | None]] = []
+
+    class _Reporter:
+        def update(self, message: str, *, percentage: int | None = None) -> None:
+            reported.append((threading.get_ident(), percentage))
+
+    class _SlowDet:
+        def analyze_volume(self, volume: Volume) -> EncryptionFinding:
+            # Later volumes finish first, so their progress is produced first.
+            time.sleep(0.01 * (4 - volume.offset // 512))
+            return EncryptionFinding(status=EncryptionStatus.NOT_DETECTED)
+
+    manager = AnalysisManager(
+        driver=_StubDriver(volumes),
+        filesystem_detector=_FsDet(FileSystemType.NTFS),
+        encryption_detectors=[_SlowDet()],
+        metadata_scanner=_NoopMetadataScanner(),
+        report_exporter=_DummyExporter(),
+        progress_reporter=_Reporter(),
+        max_workers=4,
+    )
+    source = DiskSource(identifier="img", source_type=SourceType.DISK_IMAGE, display_name="img", path=Path("/tmp/a"))
+    manager.start_session(source)
+    reported.clear()
+
+    manager.analyze([v.identifier for v in volumes], collect_metadata=False)
+
+    assert {thread for thread, _ in reported} == {threading.get_ident()}
+    percentages = [percentage for _, percentage in reported if percentage is not None]
+    assert percentages == sorted(percentages)
+    assert percentages[-1] == 95
+
+
+def test_repeat_analysis_in_session_reuses_detector_findings() -> None:
+    vol = Volume(identifier="v1", offset=0, size=1, filesystem=FileSystemType.UNKNOWN)
+    driver = _StubDriver([vol])
+    calls: list[str] = []
+
+    class _CountingDet:
+        def analyze_volume(self, volume: Volume) -> EncryptionFinding:
+            calls.append(volume.identifier)
+            return EncryptionFinding(status=EncryptionStatus.NOT_DETECTED)
+
+    manager = AnalysisManager(
+        driver=driver,
+        filesystem_detector=_FsDet(FileSystemType.NTFS),
+        encryption_detectors=[_CountingDet()],
+        metadata_scanner=_NoopMetadataScanner(),
+        report_exporter=_DummyExporter(),
+    )
+
+    source = DiskSource(identifier="img", source_type=SourceType.DISK_IMAGE, display_name="img", path=Path("/tmp/a"))
+    manager.start_session(source)
+    manager.analyze(["v1"], collect_metadata=False)
+    manager.analyze(["v1"], collect_metadata=False)
+    assert calls == ["v1"]
+
+    manager.start_session(source)
+    manager.analyze(["v1"], collect_metadata=False)
+    assert calls == ["v1", "v1"]
+
+
+def test_each_session_gets_fresh_volumes_from_the_driver() -> None:
+    class _FreshDriver(_StubDriver):
+        list_calls = 0
+
+        def list_volumes(self):  # type: ignore[override]
+            type(self).list_calls += 1
+            return [Volume(identifier="v1", offset=0, size=1, filesystem=FileSystemType.UNKNOWN)]
+
+    manager = AnalysisManager(
+        driver=_FreshDriver([]),
+        filesystem_detector=_FsDet(FileSystemType.NTFS),
+        encryption_detectors=[],
+        metadata_scanner=_NoopMetadataScanner(),
+        report_exporter=_DummyExporter(),
+    )
+
+    source = DiskSource(identifier="img", source_type=SourceType.DISK_IMAGE, display_name="img", path=Path("/tmp/a"))
+    first = manager.start_session(source)
+    manager.analyze(["v1"], collect_metadata=False)
+    second = manager.start_session(source)
+
+    # Results of the previous session must not leak through shared Volume objects.
+    assert _FreshDriver.list_calls == 2
+    assert first.volumes[0].filesystem is FileSystemType.NTFS
+    assert second.volumes[0] is not first.volumes[0]
+    assert second.volumes[0].filesystem is FileSystemType.UNKNOWN
+
+
+def test_metadata_progress_is_throttled() -> None:
+    vol = Volume(identifier="v1", offset=0, size=1, filesystem=FileSystemType.NTFS)
+    messages: list[tuple[str, int | None]] = []
+
+    class _Reporter:
+        def update(self, message: str, *, percentage: int | None = None) -> None:
+            messages.append((message, percentage))
+
+    class _ChattyScanner:
+        def scan(self, _volume: Volume, *, progress=None, cancel_event=None):  # type: ignore[override]
+            for _ in range(1000):
+                progress(3, "file", "/a")
+            progress(4, "file", "/b")
+            progress(100, None, None)
+            progress(100, None, None)
+            return None
+
+    manager = AnalysisManager(
+        driver=_StubDriver([vol]),
+        filesystem_detector=_FsDet(FileSystemType.NTFS),
+        encryption_detectors=[],
+        metadata_scanner=_ChattyScanner(),
+        report_exporter=_DummyExporter(),
+        progress_reporter=_Reporter(),
+    )
+    manager.start_session(DiskSource(identifier="img", source_type=SourceType.DISK_IMAGE, display_name="img"))
+    manager.analyze(["v1"])
+
+    scans = [m for m, _ in messages if "skanowanie metadanych" in m]
+    assert len(scans) < 10
+    assert any("(4%)" in m for m in scans)
+    assert sum("(100%)" in m for m in scans) == 2
+
+
+def test_progress_math_is_exact_integer_arithmetic() -> None:
+    assert AnalysisManager._progress_percentage(0, 0) == 50
+    assert AnalysisManager._progress_percentage(1, 3) == 41
+    assert AnalysisManager._progress_percentage(3, 3) == 95
+    # 0.29 * 100 in floating point is 28.999...
+    assert AnalysisManager._interpolate_progress(0, 100, 29) == 29
+    assert AnalysisManager._interpolate_progress(10, 10, 150) == 11
+    assert AnalysisManager._interpolate_progress(10, 20, -5) == 10
+
+
+@pytest.mark.parametrize("skip", [False, True])
+def test_encryption_detection_on_unknown_fs_is_skipped_only_when_requested(skip: bool) -> None:
+    vol = Volume(identifier="v1", offset=0, size=1, filesystem=FileSystemType.UNKNOWN)
+    calls: list[str] = []
+
+    class _EncryptedDet:
+        def analyze_volume(self, v: Volume) -> EncryptionFinding:
+            calls.append(v.identifier)
+            return EncryptionFinding(status=EncryptionStatus.ENCRYPTED, algorithm="BitLocker")
+
+    manager = AnalysisManager(
+        driver=_StubDriver([vol]),
+        filesystem_detector=_FsDet(FileSystemType.UNKNOWN),
+        encryption_detectors=[_EncryptedDet()],
+        metadata_scanner=_NoopMetadataScanner(),
+        report_exporter=_DummyExporter(),
+        skip_encryption_on_unknown_fs=skip,
+    )
+    manager.start_session(DiskSource(identifier="img", source_type=SourceType.DISK_IMAGE, display_name="img"))
+
+    finding = manager.analyze(["v1"]).volumes[0].encryption
+
+    if skip:
+        assert calls == []
+        assert finding.status is EncryptionStatus.UNKNOWN
+    else:
+        assert calls == ["v1"]
+        assert finding.algorithm == "BitLocker"
+
+
+def test_staged_metadata_outlives_manager_close(tmp_path) -> None:
+    import gc
+    from pathlib import PurePosixPath
+
+    from crypto_analyzer.core.models import DirectoryNode
+    from crypto_analyzer.metadata import MetadataResult
+
+    class _Scanner:
+        def scan(self, _volume: Volume, *, progress=None, cancel_event=None):  # type: ignore[override]
+            root = DirectoryNode(name="/", path=PurePosixPath("/"))
+            return MetadataResult(root=root, total_files=0, total_directories=1)
+
+    vol = Volume(identifier="v1", offset=0, size=1, filesystem=FileSystemType.UNKNOWN)
+    staging_path = tmp_path / "stage.jsonl"
+    manager = AnalysisManager(
+        driver=_StubDriver([vol]),
+        filesystem_detector=_FsDet(FileSystemType.NTFS),
+        encryption_detectors=[],
+        metadata_scanner=_Scanner(),
+        report_exporter=_DummyExporter(),
+        staging_path=staging_path,
+    )
+    manager.start_session(DiskSource(identifier="img", source_type=SourceType.DISK_IMAGE, display_name="img"))
+    result = manager.analyze(["v1"])
+    manager.close()
+
+    # The result still references the staging file after the manager is closed.
+    assert result.volumes[0].metadata is None
+    assert result.volumes[0].load_metadata().total_directories == 1
+
+    del manager, result
+    gc.collect()
+    assert not staging_path.exists()
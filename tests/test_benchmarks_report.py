@@ -28,3 +28,50 @@ def test_benchmark_report_writes_json_and_markdown(tmp_path) -> None:
     assert "# Benchmark Report" in md
     assert "## heuristic_encryption" in md
     assert "## signature_magic_bytes" in md
+
+
+def test_heuristic_metrics_ignore_partially_encrypted_cells() -> None:
+    from crypto_analyzer.benchmarks.heuristics import _compute_metrics
+
+    metrics = _compute_metrics(
+        {
+            "encrypted -> encrypted": 3,
+            "encrypted -> unknown": 1,
+            "encrypted -> partially_encrypted": 5,
+            "unknown -> encrypted": 1,
+            "not_detected -> not_detected": 3,
+            "partially_encrypted -> encrypted": 7,
+        }
+    )
+
+    assert metrics == {
+        "encrypted_precision": 0.75,
+        "encrypted_recall": 0.75,
+        "encrypted_fp_rate_non_encrypted": 0.25,
+    }
+
+
+def test_parallel_benchmark_run_matches_serial_run(tmp_path) -> None:
+    serial = run_all_benchmarks(sample_size=8 * 1024, seeds=2, seed_base=100, images_dir=tmp_path)
+    parallel = run_all_benchmarks(sample_size=8 * 1024, seeds=2, seed_base=100, images_dir=tmp_path, parallel=True)
+
+    assert parallel.benchmarks == serial.benchmarks
+    assert [b["name"] for b in parallel.benchmarks] == [
+        "signature_magic_bytes",
+        "heuristic_encryption",
+        "filesystem_detection",
+    ]
+
+
+def test_in_memory_driver_view_shares_the_backing_buffer() -> None:
+    from crypto_analyzer.benchmarks.synthetic import InMemoryDriver
+
+    buf = bytearray(b"abcdef")
+    driver = InMemoryDriver(memoryview(buf).toreadonly())
+
+    view = driver.read_view(2, 10)
+    buf[2] = ord("X")
+
+    assert view.readonly
+    assert view.tobytes() == b"Xdef"
+    assert driver.read(1, 2) == b"bX"
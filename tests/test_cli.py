@@ -77,3 +77,27 @@ def test_run_analysis_lists_physical_devices() -> None:
 
     assert result == 0
     driver_instance.close.assert_called_once()
+
+
+def test_parser_is_built_once_and_reusable() -> None:
+    parser = _build_parser()
+    assert _build_parser() is parser
+
+    first = parser.parse_args(["a.img", "--signature-id", "bitlocker"])
+    second = parser.parse_args(["b.img"])
+    assert first.signature_ids == ["bitlocker"]
+    assert second.signature_ids is None
+    assert second.source == Path("b.img")
+
+
+def test_importing_cli_defers_analysis_stack() -> None:
+    import subprocess
+    import sys
+
+    code = (
+        "import sys, crypto_analyzer.cli; "
+        "print(sorted(m for m in ('pytsk3', 'crypto_analyzer.core', 'crypto_analyzer.drivers') "
+        "if m in sys.modules))"
+    )
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == "[]"
@@ -35,3 +35,25 @@ def test_heuristic_returns_unknown_for_all_zeros() -> None:
     finding = detector.analyze_volume(make_volume(data, filesystem=FileSystemType.UNKNOWN))
 
     assert finding.status is EncryptionStatus.UNKNOWN
+
+
+def test_histogram_stats_match_reference_byte_loop() -> None:
+    import math
+
+    from crypto_analyzer.crypto_detection.heuristics import _byte_histogram, _histogram_stats
+
+    def reference(data: bytes) -> tuple[float, float, float]:
+        counts = [0] * 256
+        for b in data:
+            counts[b] += 1
+        entropy = 0.0
+        for c in counts:
+            if c:
+                p = c / len(data)
+                entropy -= p * math.log2(p)
+        return entropy, counts[0] / len(data), max(counts) / len(data)
+
+    for data in (deterministic_random_bytes(8192, seed=7), b"\x00" * 4096, b"ab" * 300 + b"\xff"):
+        assert _histogram_stats(data) == reference(data)
+        assert sum(_byte_histogram(data)) == len(data)
+    assert _histogram_stats(b"") == (0.0, 0.0, 0.0)
@@ -40,3 +40,47 @@ def test_format_entry_details() -> None:
     assert details.startswith("/a/b")
     assert "owner:" in details
     assert "mtime:" in details
+
+
+def test_results_tree_shows_staged_metadata(qapp, tmp_path) -> None:
+    from pathlib import PurePosixPath
+
+    from crypto_analyzer.core.models import (
+        AnalysisResult,
+        DirectoryNode,
+        DiskSource,
+        EncryptionStatus,
+        FileSystemType,
+        SourceType,
+        Volume,
+        VolumeAnalysis,
+    )
+    from crypto_analyzer.core.staging import MetadataStaging
+    from crypto_analyzer.crypto_detection import EncryptionFinding
+    from crypto_analyzer.metadata import MetadataResult
+
+    staging = MetadataStaging(tmp_path / "stage.jsonl")
+    root = DirectoryNode(name="/", path=PurePosixPath("/"))
+    root.subdirectories.append(DirectoryNode(name="docs", path=PurePosixPath("/docs")))
+    staged = staging.stash(MetadataResult(root=root, total_files=0, total_directories=2))
+    result = AnalysisResult(
+        source=DiskSource(identifier="img", source_type=SourceType.DISK_IMAGE, display_name="img"),
+        volumes=[
+            VolumeAnalysis(
+                volume=Volume(identifier="v1", offset=0, size=1, filesystem=FileSystemType.NTFS),
+                filesystem=FileSystemType.NTFS,
+                encryption=EncryptionFinding(status=EncryptionStatus.NOT_DETECTED),
+                staged_metadata=staged,
+            )
+        ],
+    )
+
+    window = MainWindow()
+    window._populate_results_tree(result)
+    volume_item = window._results_tree.topLevelItem(0)
+    root_item = volume_item.child(0)
+    assert root_item.text(0) == "/"
+    assert root_item.child(0).text(0) == "docs"
+    summary = window._format_result_summary(result, collect_metadata=True)
+    assert window._text("summary.metadata.volume.collected") in summary
+    staging.close()
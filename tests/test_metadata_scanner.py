@@ -171,3 +171,32 @@ def test_scanner_parallel_matches_sequential() -> None:
     root_node = result.root
     assert root_node.files[0].encryption == EncryptionStatus.ENCRYPTED
     assert root_node.subdirectories[0].files[0].attributes[0].startswith("mode:")
+
+
+def test_scanner_shares_owner_and_attribute_objects() -> None:
+    meta_a = FakeMeta(meta_type=pytsk3.TSK_FS_META_TYPE_REG, uid=1000, gid=1000, flags=pytsk3.TSK_FS_META_FLAG_ALLOC, mode=0o100644)
+    meta_b = FakeMeta(meta_type=pytsk3.TSK_FS_META_TYPE_REG, uid=1000, gid=1000, flags=pytsk3.TSK_FS_META_FLAG_ALLOC, mode=0o100644)
+    scanner = TskMetadataScanner(StubDriver({}), max_workers=1)
+
+    assert scanner._extract_attributes(meta_a) is scanner._extract_attributes(meta_b)
+    assert TskMetadataScanner._format_owner(1000, 1000) is TskMetadataScanner._format_owner(1000, 1000)
+    assert "alloc" in scanner._extract_attributes(meta_a)
+
+
+def test_file_metadata_field_order_matches_positional_construction() -> None:
+    from dataclasses import fields
+
+    from crypto_analyzer.core.models import FileMetadata
+
+    assert [f.name for f in fields(FileMetadata)] == [
+        "name",
+        "path",
+        "size",
+        "owner",
+        "created_at",
+        "changed_at",
+        "modified_at",
+        "accessed_at",
+        "attributes",
+        "encryption",
+    ]
@@ -78,3 +78,72 @@ def test_export_csv(tmp_path) -> None:
     assert "volume_id" in header
     assert "attributes" in header
     assert "changed_at" in header
+
+
+def test_staged_metadata_exports_like_in_memory(tmp_path) -> None:
+    from crypto_analyzer.core.staging import MetadataStaging
+
+    analysis = _sample_analysis()
+    root = analysis.volumes[0].metadata.root
+    root.subdirectories.append(DirectoryNode(name="sub", path=PurePosixPath("/sub")))
+    exporter = DefaultReportExporter()
+    exporter.export(analysis, tmp_path / "memory.csv", ExportFormat.CSV)
+    exporter.export(analysis, tmp_path / "memory.json", ExportFormat.JSON)
+
+    staging = MetadataStaging(tmp_path / "stage" / "volumes.jsonl")
+    analysis.volumes[0].staged_metadata = staging.stash(analysis.volumes[0].metadata)
+    analysis.volumes[0].metadata = None
+    exporter.export(analysis, tmp_path / "staged.csv", ExportFormat.CSV)
+    exporter.export(analysis, tmp_path / "staged.json", ExportFormat.JSON)
+
+    assert analysis.totals() == (1, 1)
+    assert (tmp_path / "staged.csv").read_bytes() == (tmp_path / "memory.csv").read_bytes()
+    assert (tmp_path / "staged.json").read_bytes() == (tmp_path / "memory.json").read_bytes()
+
+    staging.close()
+    assert not staging.path.exists()
+
+
+def test_staging_round_trips_trees_deeper_than_recursion_limit(tmp_path) -> None:
+    import sys
+
+    from crypto_analyzer.core.staging import MetadataStaging
+
+    root = _sample_analysis().volumes[0].metadata.root
+    node = root
+    for depth in range(sys.getrecursionlimit() + 100):
+        child = DirectoryNode(name=f"d{depth}", path=PurePosixPath(f"/d{depth}"))
+        node.subdirectories.append(child)
+        node = child
+
+    staging = MetadataStaging(tmp_path / "volumes.jsonl")
+    staged = staging.stash(MetadataResult(root=root, total_files=1, total_directories=2))
+    restored = staged.load()
+    staging.close()
+
+    assert restored.root.files == root.files
+    assert restored.root.attributes == ("alloc",)
+    names = []
+    node = restored.root
+    while node.subdirectories:
+        node = node.subdirectories[0]
+        names.append(node.name)
+    assert len(names) == sys.getrecursionlimit() + 100
+    assert names[-1] == f"d{len(names) - 1}"
+
+
+def test_streamed_json_matches_single_dump(tmp_path) -> None:
+    exporter = DefaultReportExporter()
+    analysis = _sample_analysis()
+    second = Volume(identifier="vol2", offset=4096, size=4096, filesystem=FileSystemType.UNKNOWN)
+    analysis.volumes.append(
+        VolumeAnalysis(volume=second, filesystem=FileSystemType.UNKNOWN, encryption=EncryptionFinding(status=second.encryption))
+    )
+    empty = AnalysisResult(source=analysis.source)
+
+    for name, result in (("full", analysis), ("empty", empty)):
+        destination = tmp_path / f"{name}.json"
+        exporter.export(result, destination, ExportFormat.JSON)
+        payload = exporter._json_header(result)
+        payload["volumes"] = [exporter._volume_to_dict(volume) for volume in result.volumes]
+        assert destination.read_text(encoding="utf-8") == json.dumps(payload, indent=2, ensure_ascii=False)
@@ -20,3 +20,33 @@ def test_session_add_volume_deduplicates_by_identifier() -> None:
 
     assert len(session.volumes) == 1
     assert session.volumes[0].identifier == "v1"
+
+
+def test_session_add_volume_sees_volumes_appended_directly() -> None:
+    source = DiskSource(identifier="s", source_type=SourceType.DISK_IMAGE, display_name="s", path=Path("/tmp/a"))
+    v1 = Volume(identifier="v1", offset=0, size=1, filesystem=FileSystemType.UNKNOWN)
+    session = AnalysisSession(source=source, volumes=[v1])
+
+    session.volumes.append(Volume(identifier="v2", offset=1, size=1, filesystem=FileSystemType.UNKNOWN))
+    session.add_volume(Volume(identifier="v1", offset=5, size=1, filesystem=FileSystemType.UNKNOWN))
+    session.add_volume(Volume(identifier="v2", offset=5, size=1, filesystem=FileSystemType.UNKNOWN))
+    session.add_volume(Volume(identifier="v3", offset=5, size=1, filesystem=FileSystemType.UNKNOWN))
+
+    assert [volume.identifier for volume in session.volumes] == ["v1", "v2", "v3"]
+
+
+def test_session_add_volume_sees_volumes_replaced_in_place() -> None:
+    source = DiskSource(identifier="s", source_type=SourceType.DISK_IMAGE, display_name="s", path=Path("/tmp/a"))
+    session = AnalysisSession(
+        source=source,
+        volumes=[
+            Volume(identifier="a", offset=0, size=1, filesystem=FileSystemType.UNKNOWN),
+            Volume(identifier="b", offset=1, size=1, filesystem=FileSystemType.UNKNOWN),
+        ],
+    )
+
+    session.volumes[1] = Volume(identifier="c", offset=1, size=1, filesystem=FileSystemType.UNKNOWN)
+    session.add_volume(Volume(identifier="c", offset=5, size=1, filesystem=FileSystemType.UNKNOWN))
+    session.add_volume(Volume(identifier="b", offset=5, size=1, filesystem=FileSystemType.UNKNOWN))
+
+    assert [volume.identifier for volume in session.volumes] == ["a", "c", "b"]
@@ -104,3 +104,165 @@ def test_signature_based_detector_custom_version_extractor() -> None:
     assert finding.status == EncryptionStatus.ENCRYPTED
     assert finding.algorithm == "CustomEnc"
     assert finding.version == "42"
+
+
+def test_unanchored_prefilter_keeps_first_match_order() -> None:
+    def _sig(identifier: str, *patterns: bytes) -> EncryptionSignature:
+        return EncryptionSignature(
+            identifier=identifier,
+            name=identifier,
+            status=EncryptionStatus.ENCRYPTED,
+            matchers=[SignatureMatcher(type="contains", pattern=p) for p in patterns],
+            max_read=64,
+        )
+
+    signatures = [_sig("both", b"AB", b"ZZ"), _sig("overlap", b"BC"), _sig("prefix", b"A")]
+    volume = Volume(identifier="vol1", offset=0, size=64, filesystem=FileSystemType.UNKNOWN)
+
+    assert SignatureBasedDetector(DummyDriver(b"..ABC.."), signatures=signatures).analyze_volume(volume).algorithm == "overlap"
+    assert SignatureBasedDetector(DummyDriver(b"..A.."), signatures=signatures).analyze_volume(volume).algorithm == "prefix"
+    assert (
+        SignatureBasedDetector(DummyDriver(b"\x00" * 64), signatures=signatures).analyze_volume(volume).status
+        == EncryptionStatus.NOT_DETECTED
+    )
+
+
+def test_shared_unanchored_pattern_is_searched_once_per_volume() -> None:
+    searched: list[bytes] = []
+
+    class _CountingBytes(bytes):
+        def __contains__(self, item) -> bool:  # type: ignore[override]
+            searched.append(bytes(item))
+            return super().__contains__(item)
+
+    class _Driver(DummyDriver):
+        def read(self, offset: int, size: int) -> bytes:
+            return _CountingBytes(super().read(offset, size))
+
+    def _sig(identifier: str, *matchers: SignatureMatcher) -> EncryptionSignature:
+        return EncryptionSignature(
+            identifier=identifier, name=identifier, status=EncryptionStatus.ENCRYPTED, matchers=list(matchers), max_read=64
+        )
+
+    shared = SignatureMatcher(type="contains", pattern=b"MAGIC")
+    signatures = [
+        _sig("a", shared, SignatureMatcher(type="equals", pattern=b"A", offset=0)),
+        _sig("b", shared, SignatureMatcher(type="equals", pattern=b"B", offset=0)),
+        _sig("c", SignatureMatcher(type="contains", pattern=b"NOPE"), shared),
+    ]
+    volume = Volume(identifier="vol1", offset=0, size=64, filesystem=FileSystemType.UNKNOWN)
+
+    finding = SignatureBasedDetector(_Driver(b"B..MAGIC.."), signatures=signatures).analyze_volume(volume)
+    assert finding.algorithm == "b"
+    assert searched.count(b"MAGIC") == 1
+
+    searched.clear()
+    finding = SignatureBasedDetector(_Driver(b"...."), signatures=signatures).analyze_volume(volume)
+    assert finding.status == EncryptionStatus.NOT_DETECTED
+    assert searched == [b"MAGIC", b"NOPE"]
+
+
+def test_unknown_matcher_type_still_goes_through_signature_matches() -> None:
+    import pytest
+
+    signature = EncryptionSignature(
+        identifier="odd",
+        name="Odd",
+        status=EncryptionStatus.ENCRYPTED,
+        matchers=[SignatureMatcher(type="regex", pattern=b"x")],
+        max_read=16,
+    )
+    detector = SignatureBasedDetector(DummyDriver(b"x" * 16), signatures=[signature])
+    volume = Volume(identifier="vol1", offset=0, size=16, filesystem=FileSystemType.UNKNOWN)
+
+    with pytest.raises(ValueError, match="Nieobsługiwany typ matchera"):
+        detector.analyze_volume(volume)
+
+
+def test_overlapping_read_regions_are_fetched_in_one_driver_read() -> None:
+    reads: list[tuple[int, int]] = []
+
+    class _Driver(DummyDriver):
+        def read(self, offset: int, size: int) -> bytes:
+            reads.append((offset, size))
+            return super().read(offset, size)
+
+    def _sig(identifier: str, read_offset: int, max_read: int, pattern: bytes) -> EncryptionSignature:
+        return EncryptionSignature(
+            identifier=identifier,
+            name=identifier,
+            status=EncryptionStatus.ENCRYPTED,
+            matchers=[SignatureMatcher(type="equals", pattern=pattern, offset=0)],
+            max_read=max_read,
+            read_offset=read_offset,
+        )
+
+    header = bytearray(4096)
+    header[1024:1028] = b"SECO"
+    header[3000:3004] = b"FAR!"
+    signatures = [
+        _sig("first", 0, 1024, b"NOPE"),
+        _sig("second", 1024, 512, b"SECO"),
+        _sig("third", 3000, 16, b"FAR!"),
+    ]
+    volume = Volume(identifier="vol1", offset=100, size=4096, filesystem=FileSystemType.UNKNOWN)
+    driver = _Driver(bytes(100) + bytes(header))
+
+    finding = SignatureBasedDetector(driver, signatures=signatures).analyze_volume(volume)
+    assert finding.algorithm == "second"
+    assert reads == [(100, 1536)]
+
+    reads.clear()
+    finding = SignatureBasedDetector(driver, signatures=[signatures[0], signatures[2]]).analyze_volume(volume)
+    assert finding.algorithm == "third"
+    assert reads == [(100, 1024), (3100, 16)]
+
+
+def test_same_offset_magics_share_one_prefix_gate() -> None:
+    calls: list[object] = []
+
+    class _CountingBytes(bytes):
+        def startswith(self, prefix, *args) -> bool:  # type: ignore[override]
+            calls.append(prefix)
+            return super().startswith(prefix, *args)
+
+    class _Driver(DummyDriver):
+        def read(self, offset: int, size: int) -> bytes:
+            return _CountingBytes(super().read(offset, size))
+
+    def _sig(identifier: str, *matchers: SignatureMatcher) -> EncryptionSignature:
+        return EncryptionSignature(
+            identifier=identifier, name=identifier, status=EncryptionStatus.ENCRYPTED, matchers=list(matchers), max_read=64
+        )
+
+    signatures = [
+        _sig("luks1", SignatureMatcher(type="equals", pattern=b"LUKS\xba\xbe"), SignatureMatcher(type="equals", pattern=b"\x00\x01", offset=6)),
+        _sig("luks2", SignatureMatcher(type="equals", pattern=b"LUKS\xba\xbe"), SignatureMatcher(type="equals", pattern=b"\x00\x02", offset=6)),
+        _sig("fve", SignatureMatcher(type="equals", pattern=b"-FVE-FS-", offset=3)),
+        _sig("other", SignatureMatcher(type="equals", pattern=b"SKM\x00", offset=0)),
+    ]
+    volume = Volume(identifier="vol1", offset=0, size=64, filesystem=FileSystemType.UNKNOWN)
+
+    finding = SignatureBasedDetector(_Driver(b"LUKS\xba\xbe\x00\x02"), signatures=signatures).analyze_volume(volume)
+    assert finding.algorithm == "luks2"
+
+    calls.clear()
+    finding = SignatureBasedDetector(_Driver(b"\x00" * 64), signatures=signatures).analyze_volume(volume)
+    assert finding.status == EncryptionStatus.NOT_DETECTED
+    assert calls == [(b"LUKS\xba\xbe", b"SKM\x00"), b"-FVE-FS-"]
+
+
+def test_detectors_over_loaded_signatures_share_one_plan() -> None:
+    first = SignatureBasedDetector(DummyDriver(b""))
+    second = SignatureBasedDetector(DummyDriver(b"\x00" * 16))
+    assert first._plan is second._plan
+    assert first._driver is not second._driver
+
+    subset = SignatureBasedDetector(DummyDriver(b""), signature_ids=["bitlocker"])
+    assert subset._plan is SignatureBasedDetector(DummyDriver(b""), signature_ids=("bitlocker",))._plan
+    assert [signature.identifier for signature in subset._signatures] == ["bitlocker"]
+
+
+def test_detector_uses_the_probes_compiled_by_signatures() -> None:
+    detector = SignatureBasedDetector(DummyDriver(b""))
+    assert all(probe is signature.probe for probe, signature in zip(detector._plan.probes, detector._signatures))
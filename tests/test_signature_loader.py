@@ -4,8 +4,11 @@ from __future__ import annotations
 
 import json
 
+import pytest
+
 from crypto_analyzer.core.models import EncryptionStatus
 from crypto_analyzer.crypto_detection.signature_loader import (
+    EncryptionSignature,
     SignatureMatcher,
     VersionExtractor,
     load_default_signatures,
@@ -42,3 +45,87 @@ def test_load_signatures_from_custom_file(tmp_path) -> None:
     assert signature.status == EncryptionStatus.ENCRYPTED
     assert isinstance(signature.matchers[0], SignatureMatcher)
     assert isinstance(signature.version, VersionExtractor)
+
+
+def test_anchored_matchers_handle_bounds_like_slices() -> None:
+    data = b"xxABCyy"
+    for matcher_type in ("contains", "equals"):
+        for offset in (0, 2, 3, 5, 7, 8):
+            for pattern in (b"ABC", b"yy", b""):
+                matcher = SignatureMatcher(type=matcher_type, pattern=pattern, offset=offset)
+                end = offset + len(pattern)
+                expected = end <= len(data) and data[offset:end] == pattern
+                assert matcher.matches(data) is expected, (matcher_type, offset, pattern)
+    assert SignatureMatcher(type="equals", pattern=b"xx").matches(data)
+    assert SignatureMatcher(type="contains", pattern=b"AB").matches(data)
+
+
+def test_signatures_by_id_are_shared_frozen_subsets() -> None:
+    from crypto_analyzer.crypto_detection.signature_loader import load_signatures_by_id
+
+    defaults = load_default_signatures()
+    assert isinstance(defaults, tuple)
+
+    subset = load_signatures_by_id(frozenset({"veracrypt", "bitlocker", "missing"}))
+    assert subset is load_signatures_by_id(frozenset({"bitlocker", "veracrypt", "missing"}))
+    assert [s.identifier for s in subset] == [s.identifier for s in defaults if s.identifier in {"bitlocker", "veracrypt"}]
+    assert load_signatures_by_id(frozenset()) == ()
+
+
+def test_compiled_matches_agree_with_matchers() -> None:
+    data = b"\x00\x01HEADERxxTAIL\x00"
+    candidates = [
+        SignatureMatcher(type="contains", pattern=b"TAIL"),
+        SignatureMatcher(type="contains", pattern=b"MISSING"),
+        SignatureMatcher(type="equals", pattern=b"\x00\x01"),
+        SignatureMatcher(type="contains", pattern=b"HEADER", offset=2),
+        SignatureMatcher(type="contains", pattern=b"HEADER", offset=3),
+    ]
+    for first in candidates:
+        for second in candidates:
+            for matchers in ([first], [first, second]):
+                signature = EncryptionSignature(
+                    identifier="x", name="x", status=EncryptionStatus.ENCRYPTED, matchers=matchers
+                )
+                assert signature.matches(data) is all(m.matches(data) for m in matchers)
+
+    unknown = EncryptionSignature(
+        identifier="x",
+        name="x",
+        status=EncryptionStatus.ENCRYPTED,
+        matchers=[SignatureMatcher(type="regex", pattern=b"x")],
+    )
+    with pytest.raises(ValueError):
+        unknown.matches(data)
+
+
+def test_status_strings_map_case_insensitively() -> None:
+    from crypto_analyzer.crypto_detection.signature_loader import _status_from_string
+
+    assert _status_from_string("Encrypted") is EncryptionStatus.ENCRYPTED
+    assert _status_from_string("PARTIAL") is EncryptionStatus.PARTIALLY_ENCRYPTED
+    with pytest.raises(ValueError, match="Nieznany status szyfrowania"):
+        _status_from_string("maybe")
+
+
+def test_uint_version_extractor_matches_int_from_bytes() -> None:
+    data = bytes(range(1, 33))
+    for length in (None, 1, 2, 3, 4, 8, 16):
+        for offset in (0, 5, 24, 30, 31):
+            extractor = VersionExtractor(type="uint16-le", offset=offset, length=length)
+            size = length or 2
+            if offset + size > len(data):
+                expected = None
+            else:
+                expected = str(int.from_bytes(data[offset : offset + size], "little"))
+            assert extractor.extract(data) == expected, (length, offset)
+    assert VersionExtractor(type="uint16-le", offset=0).extract(b"\x00\x00") is None
+
+
+def test_ascii_version_extractor_strips_padding_like_decoded_text() -> None:
+    samples = [b"1.2\x00\x00\x00", b"\x00\x001.2\x00", b"1\x002\x00\x00", b"\xff\x001.2", b"\x00\xff\x00", b"\x00" * 6, b"v\xe91\x00\x00\x00"]
+    for sample in samples:
+        data = b"HDR" + sample + b"tail"
+        extractor = VersionExtractor(type="ascii", offset=3, length=len(sample))
+        expected = sample.decode("ascii", errors="ignore").strip("\x00") or None
+        assert extractor.extract(data) == expected, sample
@@ -154,3 +154,157 @@ def test_tsk_image_driver_open_filesystem_passes_offset(monkeypatch, tmp_path: P
     vol = Volume(identifier="img:1", offset=123, size=10, filesystem=FileSystemType.UNKNOWN)
     driver.open_filesystem(vol)
     assert captured["offset"] == 123
+
+
+def test_tsk_driver_serves_contained_reads_from_recent_regions(monkeypatch, tmp_path: Path) -> None:
+    image = tmp_path / "c.img"
+    payload = bytes(range(256)) * 512
+    image.write_bytes(payload)
+
+    import crypto_analyzer.drivers.tsk as tsk_mod
+
+    reads: list[tuple[int, int]] = []
+
+    class _Img:
+        def __init__(self, _path: str):
+            self._path = _path
+
+        def get_size(self) -> int:
+            return len(payload)
+
+        def read(self, offset: int, size: int) -> bytes:
+            reads.append((offset, size))
+            return payload[offset : offset + size]
+
+    class _VolumeInfo:
+        def __init__(self, _img):
+            raise RuntimeError("no partition table")
+
+    monkeypatch.setattr(tsk_mod.pytsk3, "Img_Info", _Img)
+    monkeypatch.setattr(tsk_mod.pytsk3, "Volume_Info", _VolumeInfo)
+
+    driver = TskImageDriver(image_paths=[image])
+    source = next(driver.enumerate_sources())
+    driver.open_source(source)
+
+    assert driver.read(0, 65536) == payload[:65536]
+    assert driver.read(0, 4096) == payload[:4096]
+    assert driver.read(1000, 24) == payload[1000:1024]
+    assert driver.read(65000, 1000) == payload[65000:66000]
+    assert reads == [(0, 65536), (65000, 1000)]
+
+    driver.close()
+    driver.open_source(source)
+    driver.read(0, 4096)
+    assert reads[-1] == (0, 4096)
+
+
+def test_tsk_driver_hands_filesystem_handle_over_once_per_thread(monkeypatch, tmp_path: Path) -> None:
+    import threading
+
+    import crypto_analyzer.drivers.tsk as tsk_mod
+    from crypto_analyzer.core.models import Volume
+
+    image = tmp_path / "d.img"
+    image.write_bytes(b"x" * 2048)
+
+    class _Img:
+        def __init__(self, _path: str):
+            self._path = _path
+
+        def get_size(self) -> int:
+            return 2048
+
+        def read(self, _offset: int, size: int) -> bytes:
+            return b"\x00" * int(size)
+
+    class _VolumeInfo:
+        def __init__(self, _img):
+            raise RuntimeError("no partition table")
+
+    opened: list[int] = []
+
+    class _FS:
+        def __init__(self, _img, *, offset: int = 0):
+            opened.append(int(offset))
+
+    monkeypatch.setattr(tsk_mod.pytsk3, "Img_Info", _Img)
+    monkeypatch.setattr(tsk_mod.pytsk3, "Volume_Info", _VolumeInfo)
+    monkeypatch.setattr(tsk_mod.pytsk3, "FS_Info", _FS)
+
+    driver = TskImageDriver(image_paths=[image])
+    source = next(driver.enumerate_sources())
+    driver.open_source(source)
+    volume = next(iter(driver.list_volumes()))
+
+    first = driver.open_filesystem(volume)
+    assert driver.open_filesystem(volume) is first
+    # The handle is handed over only once; the next open creates a new one.
+    second = driver.open_filesystem(volume)
+    assert second is not first
+    assert len(opened) == 2
+
+    other: list[object] = []
+    worker = threading.Thread(target=lambda: other.append(driver.open_filesystem(volume)))
+    worker.start()
+    worker.join()
+    assert other[0] is not second
+    # A handle opened in another thread is never handed to this one.
+    assert driver.open_filesystem(volume) is not other[0]
+    assert len(opened) == 4
+
+    driver.close()
+    driver.open_source(source)
+    assert driver.open_filesystem(next(iter(driver.list_volumes()))) is not first
+
+
+def test_tsk_image_driver_walks_partition_table_once_per_source(monkeypatch, tmp_path: Path) -> None:
+    image = tmp_path / "e.img"
+    image.write_bytes(b"x" * 4096)
+
+    import crypto_analyzer.drivers.tsk as tsk_mod
+
+    class _Img:
+        def __init__(self, _path: str):
+            self._path = _path
+
+        def get_size(self) -> int:
+            return 4096
+
+        def read(self, _offset: int, size: int) -> bytes:
+            return b"\x00" * int(size)
+
+    class _Partition:
+        def __init__(self, start: int, length: int):
+            self.start = start
+            self.len = length
+
+    class _VolInfoInfo:
+        block_size = 512
+
+    walks: list[int] = []
+
+    class _VolumeInfo:
+        def __init__(self, _img):
+            self.info = _VolInfoInfo()
+
+        def __iter__(self):
+            walks.append(1)
+            return iter([_Partition(1, 2), _Partition(20, 1)])
+
+    monkeypatch.setattr(tsk_mod.pytsk3, "Img_Info", _Img)
+    monkeypatch.setattr(tsk_mod.pytsk3, "Volume_Info", _VolumeInfo)
+
+    driver = TskImageDriver(image_paths=[image])
+    source = next(driver.enumerate_sources())
+    driver.open_source(source)
+
+    first = list(driver.list_volumes())
+    second = list(driver.list_volumes())
+    assert [(v.identifier, v.offset, v.size) for v in first] == [(v.identifier, v.offset, v.size) for v in second]
+    assert first[0] is not second[0]
+    assert len(walks) == 1
+
+    driver.open_source(source)
+    list(driver.list_volumes())
+    assert len(walks) == 2